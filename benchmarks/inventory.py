@@ -0,0 +1,104 @@
+"""
+Inventory microbenchmark on large synthetic inventories.
+
+Run from the project root:
+    python benchmarks/inventory.py [--sizes 100 1000 10000] [--changes 4]
+
+For each size, every kind is filled with that many items, then a round
+removes `changes` items down to zero and calls cleanup() + get_items(),
+the pattern of one station mix. The old name-dict inventory (full scan
+in cleanup(), filtering get_items()) is timed alongside for reference.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game.catalog import ItemCatalog, catalog as shared_catalog  # noqa: E402
+from game.PotionMixerCommand import Inventory, KINDS  # noqa: E402
+
+
+class DictInventory:
+    """The previous implementation: one name -> count dict per kind."""
+    def __init__(self):
+        self.buckets = {kind: {} for kind in KINDS}
+
+    def add_to_inventory(self, ingredient, kind, number=1):
+        bucket = self.buckets[kind]
+        bucket[ingredient] = bucket.get(ingredient, 0) + number
+
+    def remove_from_inventory(self, ingredient, kind, number=1):
+        bucket = self.buckets[kind]
+        if bucket.get(ingredient, 0) >= number:
+            bucket[ingredient] -= number
+            return True
+        return False
+
+    def get_items(self, kind):
+        return [(k, v) for k, v in self.buckets[kind].items() if v > 0]
+
+    def cleanup(self):
+        for bucket in self.buckets.values():
+            for k in [k for k, v in bucket.items() if v <= 0]:
+                del bucket[k]
+
+
+def build(cls, size):
+    names = [f"Item {i}" for i in range(size)]
+    if cls is Inventory:
+        inv = Inventory(ItemCatalog(names))  # private catalogue, sized up front
+    else:
+        inv = cls()
+    for kind in KINDS:
+        for name in names:
+            inv.add_to_inventory(name, kind, 2)
+    return inv, names
+
+
+def check_private_catalog():
+    """A private catalogue (even an empty one) must not leak names into the shared one."""
+    private = ItemCatalog()
+    inv = Inventory(private)
+    inv.add_to_inventory("Benchmark Only Item", "solids", 1)
+    assert inv.catalog is private, "Inventory replaced its private catalogue"
+    assert "Benchmark Only Item" not in shared_catalog, "private item interned in the shared catalogue"
+
+
+def mix_round(inv, names, changes):
+    # consume a few items completely, put them back, tidy up and relist
+    for name in names[:changes]:
+        inv.remove_from_inventory(name, "solids", 2)
+    inv.cleanup()
+    inv.get_items("solids")
+    for name in names[:changes]:
+        inv.add_to_inventory(name, "solids", 2)
+
+
+def time_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory cleanup/get_items microbenchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--changes", type=int, default=4, help="items emptied per round")
+    args = parser.parse_args()
+    check_private_catalog()
+
+    print(f"{'items/kind':>10} {'impl':<8}{'round us':>10}{'cleanup us':>12}{'get_items us':>14}{'copy us':>9}")
+    for size in args.sizes:
+        number = max(10, 200_000 // size)
+        for label, cls in (("dict", DictInventory), ("array", Inventory)):
+            inv, names = build(cls, size)
+            round_us = time_us(lambda: mix_round(inv, names, args.changes), number)
+            cleanup_us = time_us(inv.cleanup, number)
+            items_us = time_us(lambda: inv.get_items("solids"), number)
+            copy_us = time_us(inv.copy, number) if hasattr(inv, "copy") else float("nan")
+            print(f"{size:>10} {label:<8}{round_us:>10.1f}{cleanup_us:>12.1f}{items_us:>14.1f}{copy_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
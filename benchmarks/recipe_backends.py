@@ -0,0 +1,73 @@
+"""
+Import time and resident memory of each recipe backend.
+
+Run from the project root:
+    python benchmarks/recipe_backends.py [--runs 5]
+
+Every measurement runs in a fresh interpreter so module caches from one
+backend never leak into the other.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter, prints one JSON line
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from game.PotionMixerCommand import Mixing
+t1 = time.perf_counter()
+mixing = Mixing(backend=sys.argv[1])
+t2 = time.perf_counter()
+try:
+    import psutil
+    rss = psutil.Process().memory_info().rss
+except ImportError:
+    import resource
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss *= 1 if sys.platform == "darwin" else 1024
+print(json.dumps({
+    "import_s": t1 - t0,
+    "load_s": t2 - t1,
+    "rss_mb": rss / (1024 * 1024),
+    "pandas_loaded": "pandas" in sys.modules,
+}))
+"""
+
+
+def measure(backend):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, backend],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from game.recipes import RECIPE_BACKENDS
+    # compile data/recipes.db once so the stdlib runs measure a warm start
+    measure("stdlib")
+
+    print(f"{'backend':<8} {'import ms':>10} {'load ms':>10} {'total ms':>10} {'RSS MB':>8}  pandas")
+    for backend in RECIPE_BACKENDS:
+        runs = [measure(backend) for _ in range(args.runs)]
+        imp = statistics.median(r["import_s"] for r in runs) * 1000
+        load = statistics.median(r["load_s"] for r in runs) * 1000
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        pandas_loaded = "yes" if runs[-1]["pandas_loaded"] else "no"
+        print(f"{backend:<8} {imp:>10.1f} {load:>10.1f} {imp + load:>10.1f} {rss:>8.1f}  {pandas_loaded}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
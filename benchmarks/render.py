@@ -0,0 +1,213 @@
+"""
+Headless rendering benchmarks (SDL dummy video/audio drivers).
+
+Run from the project root:
+    python benchmarks/render.py [--seconds 1.0] [--only mixing] [--update-baseline]
+
+Every case draws one fixed, scripted state over and over (text caches are
+warmed first, so this is steady-state cost) and reports calls per second
+and per-call latency. Results are compared with benchmarks/render_baseline.json;
+--update-baseline rewrites that file so the change shows up in the diff.
+Exits 1 if any case's p50 got slower than --threshold.
+"""
+import argparse
+import atexit
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the game loads data/ and assets/ relative to the cwd
+
+import pygame  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "render_baseline.json")
+SCREEN_SIZE = (960, 640)
+
+
+# ---------------- Scripted states ----------------
+def _all_levels_data():
+    """One level holding every ingredient of every level file (counts summed)."""
+    from game.mixing_level import load_level_data
+    totals = {}
+    for n in range(1, 8):
+        data = load_level_data(n) or {}
+        for item in data.get("ingredients", []):
+            key = (item["name"], item["category"])
+            totals[key] = totals.get(key, 0) + int(item["count"])
+    ingredients = [{"name": n, "category": c, "count": k} for (n, c), k in totals.items()]
+    return {"level": 0, "objective": "Benchmark every ingredient",
+            "target_potion": None, "ingredients": ingredients}
+
+
+def _mixing_scene(screen, font, state):
+    from game.mixing_scene import MixingScene
+    from game.mixing_popup import open_station_popup
+    scene = MixingScene(screen, font)
+    scene.load_level(1)  # builds the station buttons
+    if state == "empty":
+        scene.session.load({"level": 0, "objective": "Nothing to mix", "ingredients": []})
+    else:
+        scene.session.load(_all_levels_data())
+    scene.active_tab = "solid"
+    scene.layout_ingredient_buttons()
+    if state == "popup":
+        scene.selected_ingredient = scene.ingredient_buttons[0].meta_name
+        open_station_popup(scene, next(s for s in scene.stations if s.text == "Cauldron"))
+    if state == "notification":
+        scene.notification.set("Mixed! You made: Essence of Earth, Essence of Water", 1e9)
+    return scene
+
+
+def _game_manager(screen, dirty_rendering):
+    from game.game_manager import GameManager, SCENE_RESOURCES
+    game = GameManager(screen, dirty_rendering=dirty_rendering)
+    game.preloader.wait(*{r for reqs in SCENE_RESOURCES.values() for r in reqs})
+    game.update()  # finishes preloading, starts music
+    game.start_level(1)
+    game.mixing_scene.session.load(_all_levels_data())
+    game.mixing_scene.active_tab = "solid"
+    game.mixing_scene.layout_ingredient_buttons()
+
+    def frame():
+        game.update()
+        rects = game.draw()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+    return frame
+
+
+def _level_pack(screen, font, size=500):
+    """Level select over a pack of `size` (empty) level files, flipping pages each call."""
+    from game.level_select_scene import LevelSelectScene
+    levels_dir = tempfile.mkdtemp(prefix="bench-levels-")
+    atexit.register(shutil.rmtree, levels_dir, ignore_errors=True)
+    for n in range(1, size + 1):
+        with open(os.path.join(levels_dir, f"level{n}.json"), "w") as f:
+            f.write("{}")
+    scene = LevelSelectScene(screen, font, levels_path=levels_dir)
+
+    def frame():
+        scene.set_page((scene.page + 1) % scene.page_count)
+        scene.draw()
+    return frame
+
+
+def build_cases(screen):
+    """name -> zero-argument callable drawing one frame of that state."""
+    from game.assets_loader import load_font
+    from game.level_select_scene import LevelSelectScene
+    from game.ui import Button
+
+    font = load_font(None, size=28)
+    button = Button("Dragonscale Powder x5", 60, 160, 130, 48, font)
+    level_select = LevelSelectScene(screen, font)
+    mixing = {s: _mixing_scene(screen, font, s) for s in ("empty", "full", "popup", "notification")}
+
+    return {
+        "button.draw": lambda: button.draw(screen),
+        "level_select.draw": level_select.draw,
+        "level_select.flip[500]": _level_pack(screen, font),
+        "mixing.draw[empty]": mixing["empty"].draw,
+        "mixing.draw[full]": mixing["full"].draw,
+        "mixing.draw[popup]": mixing["popup"].draw,
+        "mixing.draw[notification]": mixing["notification"].draw,
+        "game_manager.frame[full]": _game_manager(screen, dirty_rendering=False),
+        "game_manager.frame[dirty]": _game_manager(screen, dirty_rendering=True),
+    }
+
+
+# ---------------- Measuring ----------------
+def run_case(fn, seconds, warmup=20):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    end = clock() + seconds
+    while True:
+        t0 = clock()
+        fn()
+        t1 = clock()
+        samples.append((t1 - t0) * 1e6)
+        if t1 >= end:
+            break
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "calls": len(samples),
+        "fps": 1e6 / mean,
+        "mean_us": mean,
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def _delta(now, before):
+    if not before:
+        return ""
+    return f"{(now - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering benchmarks.")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent per case")
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="p50 slowdown (percent) that counts as a regression")
+    parser.add_argument("--min-delta-us", type=float, default=10.0,
+                        help="ignore slowdowns smaller than this (timer noise on tiny cases)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    cases = build_cases(screen)
+    if args.only:
+        cases = {n: fn for n, fn in cases.items() if args.only in n}
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'case':<28}{'fps':>10}{'p50 us':>10}{'p95 us':>10}{'vs baseline':>13}")
+    for name, fn in cases.items():
+        r = run_case(fn, args.seconds)
+        results[name] = r
+        before = baseline.get(name, {}).get("p50_us")
+        delta = _delta(r["p50_us"], before)
+        slower = r["p50_us"] - before if before else 0.0
+        if slower > args.min_delta_us and slower / before * 100 > args.threshold:
+            regressions.append(name)
+            delta += " !"
+        print(f"{name:<28}{r['fps']:>10.0f}{r['p50_us']:>10.1f}{r['p95_us']:>10.1f}{delta:>13}")
+
+    if args.update_baseline:
+        baseline.update({n: {k: round(v, 1) for k, v in r.items() if k != "calls"}
+                         for n, r in results.items()})
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {os.path.relpath(BASELINE_PATH, ROOT)}")
+    elif regressions:
+        print(f"Slower than baseline by more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        pygame.quit()
+        sys.exit(1)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
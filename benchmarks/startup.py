@@ -0,0 +1,91 @@
+"""
+Time-to-first-frame of the game, headless.
+
+Run from the project root:
+    python benchmarks/startup.py [--runs 5] [--compare REV]
+
+--compare checks REV (e.g. a commit before lazy scenes) out into a
+temporary git worktree and measures it the same way, for a before/after.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter (cwd = tree being measured), prints one JSON line.
+# Only uses GameManager(screen)/update()/draw(), so older trees can be measured too.
+CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, os.getcwd())
+import pygame
+pygame.init()
+screen = pygame.display.set_mode((960, 640))
+t1 = time.perf_counter()
+from game.game_manager import GameManager
+t2 = time.perf_counter()
+game = GameManager(screen)
+t3 = time.perf_counter()
+game.update()
+game.draw()
+pygame.display.flip()
+t4 = time.perf_counter()
+print(json.dumps({
+    "pygame_init_ms": (t1 - t0) * 1000,
+    "import_ms": (t2 - t1) * 1000,
+    "construct_ms": (t3 - t2) * 1000,
+    "first_frame_ms": (t4 - t0) * 1000,
+    "modules": len(sys.modules),
+    "pandas_loaded": "pandas" in sys.modules,
+}))
+os._exit(0)  # don't wait for background loaders
+"""
+
+
+def measure(tree):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=tree, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(label, tree, runs):
+    measure(tree)  # warm the OS file cache and any compiled recipe db
+    results = [measure(tree) for _ in range(runs)]
+    med = {k: statistics.median(r[k] for r in results)
+           for k in ("pygame_init_ms", "import_ms", "construct_ms", "first_frame_ms")}
+    print(f"{label:<10} {med['import_ms']:>10.1f} {med['construct_ms']:>12.1f} "
+          f"{med['first_frame_ms']:>15.1f} {results[-1]['modules']:>8}  "
+          f"{'yes' if results[-1]['pandas_loaded'] else 'no'}")
+    return med
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure headless time-to-first-frame.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--compare", metavar="REV", help="git revision to measure as the 'before'")
+    args = parser.parse_args()
+
+    print(f"{'tree':<10} {'import ms':>10} {'construct ms':>12} {'first frame ms':>15} {'modules':>8}  pandas")
+    if args.compare:
+        tmp = tempfile.mkdtemp(prefix="startup-bench-")
+        try:
+            subprocess.run(["git", "worktree", "add", "--detach", tmp, args.compare],
+                           cwd=ROOT, check=True, capture_output=True)
+            summarize(args.compare[:10], tmp, args.runs)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", tmp], cwd=ROOT, capture_output=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+    summarize("current", ROOT, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,151 +1,419 @@
-import pandas as pd
-from typing import Dict, List, Tuple
-from collections import Counter
+from array import array
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from game.catalog import ItemCatalog, catalog as shared_catalog
+from game.recipes import RecipeStore
 
-class ReservedInventoryView:
-    """
-    Wraps a real Inventory but 'reserves' some items by kind.
-    check_inventory() = base_count + reserved_count
-    remove_from_inventory() = consume reserved first, then base
-    add_to_inventory() passes through to real inventory
-    """
-    def __init__(self, base_inventory, reserved_by_kind=None):
-        self.base = base_inventory
-        self.reserved = reserved_by_kind or {
-            "fluids": Counter(),
-            "solids": Counter(),
-            "essences": Counter(),
-            "potions": Counter(),
-        }
+# inventory kinds in storage order, and every spelling _kind() accepts
+KINDS = ("fluids", "solids", "essences", "potions")
+_KIND_INDEX = {
+    "fluid": 0, "fluids": 0, "liquid": 0, "liquids": 0,
+    "solid": 1, "solids": 1,
+    "essence": 2, "essences": 2,
+    "potion": 3, "potions": 3,
+}
 
-    def _bucket(self, kind: str):
-        # Reuse the real buckets for reads
-        return self.base._bucket(kind)
 
-    def add_to_inventory(self, ingredient: str, kind: str, number: int = 1):
-        return self.base.add_to_inventory(ingredient, kind, number)
+class InventorySnapshot(NamedTuple):
+    """Frozen inventory state from Inventory.snapshot(); shares its per-kind storage."""
+    counts: tuple
+    keys: tuple
+    zeroed: tuple
+    listing: tuple
+    ledger: dict
 
-    def remove_from_inventory(self, ingredient: str, kind: str, number: int = 1) -> bool:
-        r = self.reserved[kind].get(ingredient, 0)
-        if r >= number:
-            self.reserved[kind][ingredient] = r - number
-            return True
-        need = number - r
-        if r > 0:
-            self.reserved[kind][ingredient] = 0
-        return self.base.remove_from_inventory(ingredient, kind, need)
-
-    def check_inventory(self, ingredient: str, kind: str, number: int = 1) -> bool:
-        base_have = self._bucket(kind).get(ingredient, 0)
-        res_have = self.reserved[kind].get(ingredient, 0)
-        return (base_have + res_have) >= number
-    def get_items(self, kind: str):
-        bucket = self._bucket(kind)
-        return [(k, v) for k, v in bucket.items() if v > 0]
 
+class InventoryDelta(NamedTuple):
+    """
+    Net change an action made to an inventory, as recorded by its journal:
+    counts: ((kind index, item ID), change) pairs
+    ledger: ((holder, kind index, item ID), change) pairs for reservations
+    Only touched entries are stored, however large the inventory is.
+    """
+    counts: tuple = ()
+    ledger: tuple = ()
 
-    def cleanup(self):
-        return self.base.cleanup()
 
 # Inventory that tracks counts by category
 class Inventory:
-    def __init__(self):
-        self.fluids: Dict[str, int] = {}
-        self.solids: Dict[str, int] = {}
-        self.essences: Dict[str, int] = {}
-        self.potions: Dict[str, int] = {}
+    """
+    Counts per kind, stored as fixed-width integer arrays indexed by the
+    shared ItemCatalog IDs (one array per kind, as wide as the catalogue).
+    Per kind, an insertion-ordered dict of IDs remembers which names are
+    listed, so get_items() keeps the order items were first added in and
+    cleanup() drops entries that reached zero, like the old name dicts.
+    Entries that hit zero are tracked as they happen, so cleanup() only
+    touches those and get_items() only filters when there are any; its
+    result is kept per kind until that kind changes.
+    copy(), fingerprint() and diff() are cheap enough for solvers and
+    simulations.
 
+    Items put into station slots are reserved rather than removed: a
+    ledger keyed by holder (the station) keeps them out of the counts until
+    they are committed (spent) or rolled back (returned, all at once).
 
-    def debug_counts(self):
-        # safe snapshot for prints/logs
-        return {
-            "fluids": dict(self.fluids),
-            "solids": dict(self.solids),
-            "essences": dict(self.essences),
-            "potions": dict(self.potions),
-        }
+    snapshot(), restore() and copy() are O(1): the per-kind storage is
+    shared copy-on-write and a kind is only copied the first time it
+    changes afterwards.
+
+    While a journal is open (start_journal/stop_journal) every change is
+    summed into an InventoryDelta, which apply_delta() can replay or undo.
+    """
+    def __init__(self, catalog: Optional[ItemCatalog] = None):
+        # an empty ItemCatalog is falsy (it has __len__), so test for None
+        self.catalog = catalog if catalog is not None else shared_catalog
+        width = len(self.catalog)
+        self._counts = [array("i", bytes(4 * width)) for _ in KINDS]
+        self._keys: List[Dict[int, None]] = [{} for _ in KINDS]
+        # listed IDs whose count is zero, waiting for cleanup()
+        self._zeroed: List[Set[int]] = [set() for _ in KINDS]
+        # get_items() result per kind, dropped when that kind changes
+        self._listing: List[Optional[List[Tuple[str, int]]]] = [None] * len(KINDS)
+        # holder -> {(kind index, item ID): reserved count}
+        self._ledger: Dict[object, Dict[Tuple[int, int], int]] = {}
+        # kinds whose storage is shared with a snapshot or copy
+        self._shared = [False] * len(KINDS)
+        # (counts changes, ledger changes) while a journal is open
+        self._journal = None
+
+    @staticmethod
+    def _kind(kind: str) -> int:
+        k = _KIND_INDEX.get(kind)
+        if k is None:
+            k = _KIND_INDEX.get(kind.lower())
+            if k is None:
+                raise ValueError(f"Unknown kind: {kind}")
+        return k
+
+    def _own(self, k: int) -> None:
+        # copy-on-write: first change to a kind shared with a snapshot/copy
+        if self._shared[k]:
+            self._counts[k] = self._counts[k][:]
+            self._keys[k] = self._keys[k].copy()
+            self._zeroed[k] = self._zeroed[k].copy()
+            self._shared[k] = False
 
-    def _bucket(self, kind: str) -> Dict[str, int]:
-        kind = kind.lower()
-        if kind in ("fluid", "fluids", "liquid", "liquids"):
-            return self.fluids
-        if kind in ("solid", "solids"):
-            return self.solids
-        if kind in ("essence", "essences"):
-            return self.essences
-        if kind in ("potion", "potions"):
-            return self.potions
-        raise ValueError(f"Unknown kind: {kind}")
+    def _padded(self) -> List[array]:
+        # counts as wide as the catalogue, without touching (possibly shared) arrays
+        width = len(self.catalog)
+        return [c if len(c) == width else c + array("i", bytes(4 * (width - len(c))))
+                for c in self._counts]
 
     def add_to_inventory(self, ingredient: str, kind: str, number: int = 1) -> None:
-        bucket = self._bucket(kind)
-        bucket[ingredient] = bucket.get(ingredient, 0) + max(0, int(number))
+        k = self._kind(kind)
+        item_id = self.catalog.intern(ingredient)
+        if item_id >= len(self._counts[k]):
+            # new names were interned since these arrays were sized
+            self._counts = self._padded()
+        self._own(k)
+        number = max(0, int(number))
+        self._counts[k][item_id] += number
+        self._keys[k][item_id] = None
+        self._changed(k, item_id)
+        if self._journal is not None:
+            self._log(self._journal[0], (k, item_id), number)
 
     def remove_from_inventory(self, ingredient: str, kind: str, number: int = 1) -> bool:
-        bucket = self._bucket(kind)
-        if bucket.get(ingredient, 0) >= number:
-            bucket[ingredient] -= number
+        k = self._kind(kind)
+        item_id = self.catalog.id(ingredient)
+        if item_id is None or item_id not in self._keys[k]:
+            return number <= 0
+        if self._counts[k][item_id] >= number:
+            self._own(k)
+            self._counts[k][item_id] -= number
+            self._changed(k, item_id)
+            if self._journal is not None:
+                self._log(self._journal[0], (k, item_id), -number)
             return True
         return False
 
+    def _changed(self, k: int, item_id: int) -> None:
+        if self._counts[k][item_id]:
+            self._zeroed[k].discard(item_id)
+        else:
+            self._zeroed[k].add(item_id)
+        self._listing[k] = None
+
+    def count(self, ingredient: str, kind: str) -> int:
+        k = self._kind(kind)
+        item_id = self.catalog.id(ingredient)
+        if item_id is None or item_id >= len(self._counts[k]):
+            return 0
+        return self._counts[k][item_id]
+
     def check_inventory(self, ingredient: str, kind: str, number: int = 1) -> bool:
-        bucket = self._bucket(kind)
-        return bucket.get(ingredient, 0) >= number
+        return self.count(ingredient, kind) >= number
 
     def get_items(self, kind: str) -> List[Tuple[str, int]]:
-        bucket = self._bucket(kind)
-        return [(k, v) for k, v in bucket.items() if v > 0]
+        k = self._kind(kind)
+        listing = self._listing[k]
+        if listing is None:
+            # index the array per listed ID: cost follows the items held,
+            # not the width of the catalogue
+            counts = self._counts[k]
+            names = self.catalog.names
+            listing = [(names[i], counts[i]) for i in self._keys[k]]
+            if self._zeroed[k]:
+                listing = [item for item in listing if item[1] > 0]
+            self._listing[k] = listing
+        return list(listing)
 
     def cleanup(self) -> None:
-        for bucket in (self.fluids, self.solids, self.essences, self.potions):
-            to_del = [k for k, v in bucket.items() if v <= 0]
-            for k in to_del:
-                del bucket[k]
+        """Forget entries that reached zero (only those changed since the last cleanup)."""
+        for k, zeroed in enumerate(self._zeroed):
+            if not zeroed:
+                continue
+            self._own(k)
+            keys = self._keys[k]
+            for i in self._zeroed[k]:
+                del keys[i]
+            self._zeroed[k] = set()
 
+    def debug_counts(self) -> Dict[str, Dict[str, int]]:
+        # safe snapshot for prints/logs
+        name = self.catalog.name
+        return {
+            kind: {name(i): counts[i] for i in keys}
+            for kind, counts, keys in zip(KINDS, self._counts, self._keys)
+        }
 
-def clean_up(inventory: Inventory):
-    inventory.cleanup()
+    # ---------------- Reservations ----------------
+    def reserve(self, ingredient: str, kind: str, number: int = 1, holder=None) -> bool:
+        """Take items out of the counts and hold them for `holder`; False if there aren't enough."""
+        k = self._kind(kind)
+        if number <= 0 or not self.remove_from_inventory(ingredient, kind, number):
+            return False
+        self._hold(holder, (k, self.catalog.id(ingredient)), number)
+        return True
 
+    def unreserve(self, ingredient: str, kind: str, number: int = 1, holder=None) -> bool:
+        """Give some of `holder`'s reserved items back; False if it doesn't hold that many."""
+        held = self._ledger.get(holder, {})
+        key = (self._kind(kind), self.catalog.id(ingredient))
+        if held.get(key, 0) < number:
+            return False
+        self._return(key, number)
+        self._hold(holder, key, -number)
+        return True
+
+    def commit(self, holder=None) -> Dict[str, Dict[str, int]]:
+        """The holder's reserved items were used up: forget them. Returns what was held."""
+        held = dict(self._ledger.get(holder, {}))
+        for key, number in held.items():
+            self._hold(holder, key, -number)
+        return self._named(held)
+
+    def rollback(self, holder=None) -> Dict[str, Dict[str, int]]:
+        """Return the holder's reserved items to the counts in one go. Returns what was held."""
+        held = dict(self._ledger.get(holder, {}))
+        for key, number in held.items():
+            self._return(key, number)
+            self._hold(holder, key, -number)
+        return self._named(held)
+
+    def rollback_all(self) -> None:
+        for holder in list(self._ledger):
+            self.rollback(holder)
+
+    def reserved(self, holder=None) -> Dict[str, Dict[str, int]]:
+        """{kind: {name: count}} currently held for `holder`."""
+        return self._named(self._ledger.get(holder, {}))
+
+    def _hold(self, holder, key: Tuple[int, int], number: int) -> None:
+        # change the ledger entry by `number`, dropping empty entries
+        held = self._ledger.setdefault(holder, {})
+        held[key] = held.get(key, 0) + number
+        if not held[key]:
+            del held[key]
+            if not held:
+                del self._ledger[holder]
+        if self._journal is not None:
+            self._log(self._journal[1], (holder,) + key, number)
+
+    def _return(self, key: Tuple[int, int], number: int) -> None:
+        k, item_id = key
+        if item_id >= len(self._counts[k]):
+            self._counts = self._padded()
+        self._own(k)
+        self._counts[k][item_id] += number
+        self._keys[k][item_id] = None
+        self._changed(k, item_id)
+        if self._journal is not None:
+            self._log(self._journal[0], key, number)
+
+    def _named(self, held: Dict[Tuple[int, int], int]) -> Dict[str, Dict[str, int]]:
+        out = {}
+        for (k, item_id), number in held.items():
+            out.setdefault(KINDS[k], {})[self.catalog.name(item_id)] = number
+        return out
+
+    # ---------------- Journal ----------------
+    def start_journal(self) -> None:
+        """Start summing every change into a delta (see stop_journal)."""
+        self._journal = ({}, {})
+
+    def stop_journal(self) -> InventoryDelta:
+        """Close the journal and return the net change since start_journal()."""
+        counts, ledger = self._journal or ({}, {})
+        self._journal = None
+        return InventoryDelta(
+            tuple((key, n) for key, n in counts.items() if n),
+            tuple((key, n) for key, n in ledger.items() if n),
+        )
 
-class Mixing:
-    def __init__(self):
-        # Match the lowercase "data/" path used elsewhere in the project
-        self.retort_recipes = pd.read_csv("data/Retort.csv")
-        self.mortar_recipes = pd.read_csv("data/Mortar.csv")
-        self.calc_recipes = pd.read_csv("data/Calcinator.csv")
-        self.alembic_recipes = pd.read_csv("data/Alembic.csv")
-        self.infuser_recipes = pd.read_csv("data/Infuser.csv")
-        self.wand_recipes = pd.read_csv("data/Magic_Wand.csv")
-        self.cauldron_recipes = pd.read_csv("data/Cauldron.csv")
-
-    # Helper to pull first value from a column if a mask matches any rows
     @staticmethod
-    def _first(df: pd.DataFrame, col: str):
-        if df.empty:
+    def _log(changes: dict, key: tuple, number: int) -> None:
+        changes[key] = changes.get(key, 0) + number
+
+    def apply_delta(self, delta: InventoryDelta, reverse: bool = False) -> None:
+        """Replay a recorded delta (or undo it with reverse=True)."""
+        sign = -1 if reverse else 1
+        for key, number in delta.counts:
+            self._return(key, sign * number)
+        for (holder, k, item_id), number in delta.ledger:
+            self._hold(holder, (k, item_id), sign * number)
+
+    # read-only snapshots under the old attribute names
+    fluids = property(lambda self: self.debug_counts()["fluids"])
+    solids = property(lambda self: self.debug_counts()["solids"])
+    essences = property(lambda self: self.debug_counts()["essences"])
+    potions = property(lambda self: self.debug_counts()["potions"])
+
+    # ---------------- Snapshots ----------------
+    def snapshot(self) -> InventorySnapshot:
+        """Checkpoint the current state in O(1); later changes copy only the kinds they touch."""
+        self._shared = [True] * len(KINDS)
+        return InventorySnapshot(
+            tuple(self._counts), tuple(self._keys), tuple(self._zeroed),
+            tuple(self._listing),  # lists of tuples, never mutated in place
+            {h: held.copy() for h, held in self._ledger.items()},
+        )
+
+    def restore(self, snap: InventorySnapshot) -> None:
+        """Go back to a snapshot of this inventory in O(1) (the snapshot stays reusable)."""
+        self._counts = list(snap.counts)
+        self._keys = list(snap.keys)
+        self._zeroed = list(snap.zeroed)
+        self._listing = list(snap.listing)
+        self._ledger = {h: held.copy() for h, held in snap.ledger.items()}
+        self._shared = [True] * len(KINDS)
+
+    # ---------------- Copy / compare ----------------
+    def copy(self) -> "Inventory":
+        """Independent inventory with the same counts (shares storage until either side changes)."""
+        other = Inventory.__new__(Inventory)
+        other.catalog = self.catalog
+        other._journal = None
+        other.restore(self.snapshot())
+        return other
+
+    def fingerprint(self) -> tuple:
+        """
+        Hashable summary of the counts and outstanding reservations: equal
+        fingerprints mean equal inventories.
+        """
+        # trailing zero bytes dropped, so catalogue growth doesn't change it
+        counts = tuple(counts.tobytes().rstrip(b"\0") for counts in self._counts)
+        reserved = frozenset(
+            (holder, key, number) for holder, held in self._ledger.items() for key, number in held.items()
+        )
+        return counts + (reserved,)
+
+    def diff(self, other: "Inventory") -> Dict[str, Dict[str, int]]:
+        """{kind: {name: other_count - self_count}} for every count that differs."""
+        name = self.catalog.name
+        out = {}
+        for kind, mine, theirs in zip(KINDS, self._padded(), other._padded()):
+            if mine == theirs:
+                continue
+            changed = {name(i): b - a for i, (a, b) in enumerate(zip(mine, theirs)) if a != b}
+            if changed:
+                out[kind] = changed
+        return out
+
+
+class Command(NamedTuple):
+    """
+    One reversible player action: which station it touched, the station's
+    slots before/after, the completion flag before/after, and the
+    inventory delta. Undo and redo replay the delta; nothing is re-mixed.
+    """
+    action: str  # "place", "remove", "clear" or "mix"
+    station: str
+    slots_before: tuple
+    slots_after: tuple
+    delta: InventoryDelta
+    complete_before: bool = False
+    complete_after: bool = False
+
+
+class CommandHistory:
+    """Undo/redo stacks of Commands; the oldest are dropped past `limit` entries."""
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self._undo = deque(maxlen=limit)
+        self._redo: List[Command] = []
+
+    def __len__(self) -> int:
+        """Number of commands that can be undone."""
+        return len(self._undo)
+
+    def record(self, command: Command) -> None:
+        self._undo.append(command)
+        self._redo.clear()
+
+    def undo(self) -> Optional[Command]:
+        """Command to reverse (moved to the redo stack), or None."""
+        if not self._undo:
             return None
-        try:
-            return df.iloc[0][col]
-        except Exception:
+        command = self._undo.pop()
+        self._redo.append(command)
+        return command
+
+    def redo(self) -> Optional[Command]:
+        """Command to apply again (moved back to the undo stack), or None."""
+        if not self._redo:
             return None
+        command = self._redo.pop()
+        self._undo.append(command)
+        return command
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+
+
+def clean_up(inventory: Inventory):
+    inventory.cleanup()
+
+
+class Mixing:
+    def __init__(self, data_dir: str = "data", backend: str = None):
+        # Match the lowercase "data/" path used elsewhere in the project.
+        # The default "stdlib" backend loads the compiled data/recipes.db
+        # (rebuilt automatically when a CSV changes); backend="pandas" keeps
+        # DataFrames around for analysis tooling.
+        # The tables are shared process-wide, so extra Mixing instances are free.
+        self.recipes = RecipeStore.get(data_dir, backend)
+        # size inventories for every known name up front
+        shared_catalog.intern_all(self.recipes.names())
 
     def Retort(self, inventory: Inventory, fluid: str) -> str:
         if not inventory.check_inventory(fluid, "fluids"):
             return "You don't have that potion."
         inventory.remove_from_inventory(fluid, "fluids", 1)
-        recipe = self.retort_recipes[self.retort_recipes["Input"] == fluid]
-        if recipe.empty:
+        recipe = self.recipes.lookup("Retort", fluid)
+        if recipe is None:
             return "The retort failed to produce anything..."
 
         outputs = []
-        for col in ("Output1", "Output2", "Output3"):
-            out = self._first(recipe, col)
-
-            # Filter out NaN, None, empty, and the literal "None"
-            if not isinstance(out, str):
-                continue
-            if out.strip() == "" or out.strip().lower() == "none":
-                continue
-
+        for out in recipe:
             inventory.add_to_inventory(out, "essences", 1)
             outputs.append(out)
         clean_up(inventory)
@@ -155,11 +423,9 @@ class Mixing:
         if not inventory.check_inventory(solid, "solids"):
             return "You don't have that solid."
         inventory.remove_from_inventory(solid, "solids", 1)
-        recipe = self.mortar_recipes[self.mortar_recipes["Solid"] == solid]
-        if recipe.empty:
-            return f"You couldn't grind up the {solid}..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Mortar", solid)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "solids", 1)
             clean_up(inventory)
             return f"You ground the {solid} into {output}!"
@@ -170,12 +436,9 @@ class Mixing:
             return "You lack the required solids."
         inventory.remove_from_inventory(solid1, "solids", 1)
         inventory.remove_from_inventory(solid2, "solids", 1)
-        mask = (self.calc_recipes["Solid1"] == solid1) & (self.calc_recipes["Solid2"] == solid2)
-        recipe = self.calc_recipes[mask]
-        if recipe.empty:
-            return "The calcinator created useless ash..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Calcinator", solid1, solid2)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "solids", 1)
             clean_up(inventory)
             return f"You refined {solid1} and {solid2} into {output}!"
@@ -186,12 +449,9 @@ class Mixing:
             return "You lack the required liquid/essence."
         inventory.remove_from_inventory(liquid, "fluids", 1)
         inventory.remove_from_inventory(essence, "essences", 1)
-        mask = (self.alembic_recipes["Liquid1"] == liquid) & (self.alembic_recipes["Essence1"] == essence)
-        recipe = self.alembic_recipes[mask]
-        if recipe.empty:
-            return "The alembic fills with white smoke. The reaction must not have worked..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Alembic", liquid, essence)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "fluids", 1)
             clean_up(inventory)
             return f"You transmuted {liquid} into {output} with {essence}!"
@@ -202,12 +462,9 @@ class Mixing:
             return "You lack the required solid/liquid."
         inventory.remove_from_inventory(solid, "solids", 1)
         inventory.remove_from_inventory(liquid, "fluids", 1)
-        mask = (self.infuser_recipes["Solid1"] == solid) & (self.infuser_recipes["Liquid1"] == liquid)
-        recipe = self.infuser_recipes[mask]
-        if recipe.empty:
-            return "The reaction failed and resulted in useless sludge..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Infuser", solid, liquid)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "fluids", 1)
             clean_up(inventory)
             return f"You infused {solid} into {liquid} and created {output}!"
@@ -218,12 +475,9 @@ class Mixing:
             return "You lack the required essences."
         inventory.remove_from_inventory(essence1, "essences", 1)
         inventory.remove_from_inventory(essence2, "essences", 1)
-        mask = (self.wand_recipes["Essence1"] == essence1) & (self.wand_recipes["Essence2"] == essence2)
-        recipe = self.wand_recipes[mask]
-        if recipe.empty:
-            return "The magic wand made the essences disappear..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Magic Wand", essence1, essence2)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "essences", 1)
             clean_up(inventory)
             return f"The magic wand combined {essence1} and {essence2} into {output}!"
@@ -240,16 +494,9 @@ class Mixing:
         inventory.remove_from_inventory(liquid, "fluids", 1)
         inventory.remove_from_inventory(solid, "solids", 1)
         inventory.remove_from_inventory(essence, "essences", 1)
-        mask = (
-            (self.cauldron_recipes["Liquid"] == liquid)
-            & (self.cauldron_recipes["Solid"] == solid)
-            & (self.cauldron_recipes["Essence"] == essence)
-        )
-        recipe = self.cauldron_recipes[mask]
-        if recipe.empty:
-            return "This looks more like a soup than a potion..."
-        output = self._first(recipe, "Output")
-        if output:
+        recipe = self.recipes.lookup("Cauldron", liquid, solid, essence)
+        if recipe:
+            output = recipe[0]
             inventory.add_to_inventory(output, "potions", 1)
             clean_up(inventory)
             return f"You successfully brewed a {output}!"
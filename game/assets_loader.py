@@ -1,13 +1,131 @@
 import os
+import threading
+from collections import OrderedDict
 import pygame
 
+
+# ---------------- Registry ----------------
+class AssetRegistry:
+    """
+    Process-wide cache of loaded assets: fonts by (name, size), sounds by
+    name and converted images by path. Every load bumps a reference count
+    and release() drops it. Unreferenced assets stay cached for the next
+    load until the byte budget is exceeded, then the least recently used
+    ones are evicted.
+    """
+    def __init__(self, budget_bytes=32 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        # (kind, key) -> [asset, refs, nbytes], oldest first
+        self._entries = OrderedDict()
+        self._keys_by_id = {}
+        # (kind, key) -> Event set when the thread loading it is done
+        self._loading = {}
+        self._lock = threading.RLock()
+
+    def acquire(self, kind, key, loader, sizer):
+        # the lock only guards the tables: loaders run unlocked so different
+        # assets load in parallel, and a key being loaded is waited for
+        # instead of loaded twice
+        while True:
+            with self._lock:
+                entry = self._entries.get((kind, key))
+                if entry is not None:
+                    entry[1] += 1
+                    self._entries.move_to_end((kind, key))
+                    self._evict()
+                    return entry[0]
+                pending = self._loading.get((kind, key))
+                if pending is None:
+                    pending = self._loading[(kind, key)] = threading.Event()
+                    break
+            # another thread is loading it; look again once it is done (it may have failed)
+            pending.wait()
+
+        try:
+            asset = loader()
+            nbytes = sizer(asset)
+            with self._lock:
+                self._entries[(kind, key)] = [asset, 1, nbytes]
+                self._keys_by_id[id(asset)] = (kind, key)
+                self._evict()
+            return asset
+        finally:
+            with self._lock:
+                del self._loading[(kind, key)]
+            pending.set()
+
+    def release(self, asset):
+        """Drop one reference; the asset becomes evictable once nobody holds it."""
+        with self._lock:
+            key = self._keys_by_id.get(id(asset))
+            if key is None:
+                return
+            entry = self._entries[key]
+            entry[1] = max(0, entry[1] - 1)
+            self._evict()
+
+    def _evict(self):
+        total = sum(e[2] for e in self._entries.values())
+        if total <= self.budget_bytes:
+            return
+        for key in [k for k, e in self._entries.items() if e[1] == 0]:
+            asset, _refs, nbytes = self._entries.pop(key)
+            del self._keys_by_id[id(asset)]
+            total -= nbytes
+            if total <= self.budget_bytes:
+                break
+
+    def trim(self):
+        """Evict every asset nobody currently holds."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[1] == 0]:
+                asset, _refs, _nbytes = self._entries.pop(key)
+                del self._keys_by_id[id(asset)]
+
+    def stats(self):
+        """{kind: {"count", "in_use", "bytes"}} for everything currently cached."""
+        with self._lock:
+            out = {}
+            for (kind, _key), (_asset, refs, nbytes) in self._entries.items():
+                s = out.setdefault(kind, {"count": 0, "in_use": 0, "bytes": 0})
+                s["count"] += 1
+                s["in_use"] += refs > 0
+                s["bytes"] += nbytes
+            return out
+
+    def dump_stats(self):
+        print(f"{'type':<8}{'count':>7}{'in use':>8}{'KiB':>10}")
+        for kind, s in sorted(self.stats().items()):
+            print(f"{kind:<8}{s['count']:>7}{s['in_use']:>8}{s['bytes'] / 1024:>10.1f}")
+
+
+registry = AssetRegistry()
+
+
+def release(asset):
+    """Give back an asset obtained from load_sound/load_font/load_image."""
+    registry.release(asset)
+
+
 # ---------------- Sounds ----------------
+def _sound_bytes(sound):
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+    freq, fmt, channels = init
+    return int(sound.get_length() * freq * channels * (abs(fmt) // 8))
+
+
 def load_sound(name, folder="sounds"):
-    """Load a short sound effect from assets and return a Sound object."""
+    """Load a short sound effect from assets and return a (shared) Sound object."""
     path = os.path.join("assets", folder, name)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Sound not found: {path}")
-    return pygame.mixer.Sound(path)
+
+    def loader():
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Sound not found: {path}")
+        return pygame.mixer.Sound(path)
+
+    return registry.acquire("sound", path, loader, _sound_bytes)
 
 
 # ---------------- Music ----------------
@@ -24,10 +142,34 @@ def load_music(name, folder="sounds", loop=-1, volume=0.1):
 
 # ---------------- Fonts ----------------
 def load_font(name="MedievalSharp-Regular.ttf", size=48, folder="fonts"):
-    """Load a TTF font from assets. Falls back to default font if missing."""
-    path = os.path.join("assets", folder, name)
-    if os.path.exists(path):
-        return pygame.font.Font(path, size)
-    else:
+    """
+    Load a TTF font from assets (shared per name and size). name=None gives
+    pygame's default font. Falls back to default font if missing.
+    """
+    path = os.path.join("assets", folder, name) if name else None
+
+    def loader():
+        if path is None:
+            return pygame.font.Font(None, size)
+        if os.path.exists(path):
+            return pygame.font.Font(path, size)
         print(f"Font not found: {path}, using default font")
         return pygame.font.SysFont(None, size)
+
+    def sizer(_font):
+        # fonts keep the whole TTF in memory
+        return os.path.getsize(path) if path and os.path.exists(path) else 0
+
+    return registry.acquire("font", (path, size), loader, sizer)
+
+
+# ---------------- Images ----------------
+def load_image(path):
+    """Load an image once and share the display-converted (alpha) surface."""
+    def loader():
+        return pygame.image.load(path).convert_alpha()
+
+    def sizer(surf):
+        return surf.get_pitch() * surf.get_height()
+
+    return registry.acquire("image", path, loader, sizer)
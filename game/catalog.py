@@ -0,0 +1,57 @@
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class ItemCatalog:
+    """
+    Interned name <-> integer ID table for every ingredient and product.
+    Inventories store counts in arrays indexed by these IDs, so all of
+    them (across sessions, solvers and simulations) share one catalogue.
+    IDs are never reused or removed; unknown names get the next free ID.
+    """
+    def __init__(self, names: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        self.intern_all(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._ids
+
+    def intern(self, name: str) -> int:
+        """ID for a name, assigning a new one the first time it is seen."""
+        item_id = self._ids.get(name)
+        if item_id is not None:
+            return item_id
+        with self._lock:
+            item_id = self._ids.get(name)
+            if item_id is None:
+                item_id = len(self._names)
+                name = sys.intern(name)
+                self._names.append(name)
+                self._ids[name] = item_id
+            return item_id
+
+    def intern_all(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.intern(name)
+
+    def id(self, name: str) -> Optional[int]:
+        """ID of a known name, None if it was never interned."""
+        return self._ids.get(name)
+
+    def name(self, item_id: int) -> str:
+        return self._names[item_id]
+
+    @property
+    def names(self) -> List[str]:
+        """All names, indexed by ID (the live list: read it, don't modify it)."""
+        return self._names
+
+
+# shared by every Inventory unless one is given explicitly
+catalog = ItemCatalog()
@@ -0,0 +1,79 @@
+"""
+Game time. Everything time-based (notifications, the main loop's frame
+pacing, scene timers) asks the current clock instead of the time module,
+so headless runs can swap in a ManualClock and step through minutes of
+play in milliseconds.
+"""
+import time
+import pygame
+
+
+class RealClock:
+    """Wall-clock time; tick() sleeps to cap the frame rate like pygame's Clock."""
+    def __init__(self):
+        self._pg_clock = None
+
+    def now(self):
+        """Seconds on a monotonic clock (only differences are meaningful)."""
+        return time.monotonic()
+
+    def tick(self, fps=0):
+        """Wait out the rest of the frame; returns the milliseconds since the last tick."""
+        if self._pg_clock is None:
+            self._pg_clock = pygame.time.Clock()
+        return self._pg_clock.tick(fps)
+
+
+class AcceleratedClock(RealClock):
+    """Real time running `speed` times faster (frames are still paced in real time)."""
+    def __init__(self, speed=2.0):
+        super().__init__()
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self):
+        return self._origin + (time.monotonic() - self._origin) * self.speed
+
+    def tick(self, fps=0):
+        return super().tick(fps) * self.speed
+
+
+class ManualClock:
+    """Time only moves when told to; tick() advances one frame without sleeping."""
+    def __init__(self, start=0.0):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def advance(self, seconds):
+        self._now += seconds
+
+    def set(self, seconds):
+        """Jump to an absolute time (never backwards)."""
+        self._now = max(self._now, seconds)
+
+    def tick(self, fps=0):
+        dt = 1.0 / fps if fps else 0.0
+        self._now += dt
+        return dt * 1000
+
+
+# ---------------- Current clock ----------------
+_clock = RealClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """Install a clock for the whole game; returns the previous one so it can be restored."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def now():
+    """Current game time in seconds."""
+    return _clock.now()
@@ -1,53 +1,131 @@
 import pygame
-from game.ui import Button
-from game.assets_loader import load_font, load_music
-from game.mixing_scene import MixingScene
-from game.level_select_scene import LevelSelectScene
+from game.ui import Button, DirtyRegions
+from game.assets_loader import load_font, load_music, load_sound
+from game.mixing_level import preload_levels
+from game.preloader import Preloader
+from game.profiler import profiler
+from game.recipes import RecipeStore
+from game.scene_registry import SceneRegistry
+
+# preload tasks each scene needs before it can be built
+SCENE_RESOURCES = {
+    "level_select": ("fonts",),
+    "mixing": ("fonts", "sounds", "recipes", "levels"),
+}
+SOUND_FILES = ("click.wav", "error.wav", "mix.wav", "success.wav")
+
+
+def _preload_sounds():
+    # decoded once into the asset registry; MixingScene's load_sound calls hit the cache
+    return [load_sound(name) for name in SOUND_FILES]
 
 
 class GameManager:
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rendering=False, release_scenes_after=None):
         self.screen = screen
         self.state = "menu"
 
-        # Fonts
-        self.font = load_font(size=48)
-        self.small_font = pygame.font.Font(None, 28)
+        # Dirty-rect mode: draw() repaints only changed regions and returns them
+        self.dirty_rendering = dirty_rendering
+        self.dirty = DirtyRegions(screen.get_rect())
+
+        # Fonts (the built-in one is all the first frame needs)
+        self.font = None
+        self.small_font = load_font(None, size=28)
 
         # Menu buttons
-        self.start_button = Button("Start Mixing", 360, 340, 240, 60, self.small_font)
+        self.start_button = Button("Loading...", 360, 340, 240, 60, self.small_font)
         self.back_button = Button("Back to Menu", 20, 20, 200, 50, self.small_font)
-
-        # Scenes
-        self.mixing_scene = MixingScene(screen, self.small_font)
-        self.level_select_scene = LevelSelectScene(screen, self.small_font)
-        self.mixing_scene.on_level_complete = self._handle_level_complete
-
-
-
-        # Load music
-        load_music("background.ogg")
+        self.progress_rect = pygame.Rect(360, 420, 240, 12)
+
+        # Everything slow loads on worker threads while the menu is already up
+        self.preloader = Preloader()
+        self.preloader.submit("fonts", load_font, size=48)
+        self.preloader.submit("sounds", _preload_sounds)
+        self.preloader.submit("recipes", RecipeStore.get)
+        self.preloader.submit("levels", preload_levels)
+        self._last_progress = None
+        self.music_started = False
+
+        # Scenes (and their modules) are only built on first transition;
+        # release_scenes_after=N drops scenes not shown for N seconds
+        self.scenes = SceneRegistry(release_after=release_scenes_after)
+        self.scenes.register(
+            "level_select", "game.level_select_scene", "LevelSelectScene",
+            lambda cls: cls(self.screen, self.small_font, dirty=self.dirty),
+        )
+        self.scenes.register("mixing", "game.mixing_scene", "MixingScene", self._build_mixing_scene)
+
+    def close(self):
+        """Stop background loading and give every scene's assets back."""
+        self.preloader.shutdown()
+        for name in SCENE_RESOURCES:
+            self.scenes.release(name)
+        self.start_button.close()
+        self.back_button.close()
+
+    def _build_mixing_scene(self, cls):
+        scene = cls(self.screen, self.small_font, dirty=self.dirty)
+        scene.on_level_complete = self._handle_level_complete
+        return scene
+
+    @property
+    def mixing_scene(self):
+        return self._scene("mixing")
+
+    @property
+    def level_select_scene(self):
+        return self._scene("level_select")
+
+    def _scene(self, name, block=True):
+        """Get (building on first use) a scene; waits for its preload tasks if block."""
+        reqs = SCENE_RESOURCES[name]
+        if not self.preloader.ready(*reqs):
+            if not block:
+                return None
+            self.preloader.wait(*reqs)
+        return self.scenes.get(name)
 
     # Level Helper
     def start_level(self, level_number):
-        self.mixing_scene.load_level(level_number)
+        self._scene("mixing").load_level(level_number)
         self.mixing_scene.retry_count = 0  # reset retries
-        self.state = "mixing"
+        self.set_state("mixing")
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.dirty.mark_all()
+            # hover only tracks visible buttons; the cursor may have moved while these were hidden
+            for btn in self._visible_buttons():
+                btn.sync_hover()
 
         
 
     def _handle_level_complete(self, level, retries):
-        self.level_select_scene.update_best_retry(level, retries)
-        self.level_select_scene.refresh()
+        level_select = self.level_select_scene
+        # relabels just that level's button
+        level_select.update_best_retry(level, retries)
 
     # ---------------- Event Handling ----------------
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             return
 
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle_overlay()
+            self.dirty.mark(profiler.overlay_rect(self.screen))
+            return
+
+        if event.type == pygame.MOUSEMOTION:
+            for btn in self._visible_buttons():
+                if btn.update_hover(event.pos):
+                    self.dirty.mark(btn.rect)
+
         if self.state == "menu":
-            if self.start_button.is_clicked(event):
-                self.state = "level_select"
+            # the button only works once the level select has what it needs
+            if self.start_button.is_clicked(event) and self.preloader.ready(*SCENE_RESOURCES["level_select"]):
+                self.set_state("level_select")
             return
 
         elif self.state == "level_select":
@@ -57,29 +135,112 @@ class GameManager:
         elif self.state == "mixing":
             self.mixing_scene.handle_event(event)
             if self.back_button.is_clicked(event):
-                self.state = "level_select"
+                self.level_select_scene.show_level(self.mixing_scene.current_level)
+                self.set_state("level_select")
             return
 
+    def _visible_buttons(self):
+        if self.state == "menu":
+            return [self.start_button]
+        if self.state == "level_select":
+            return self.level_select_scene.buttons()
+        if self.state == "mixing":
+            return self.mixing_scene.buttons() + [self.back_button]
+        return []
+
 
 
 
+    def is_animating(self):
+        """True while something changes on its own, so the main loop must keep ticking."""
+        if not self.music_started:
+            return True  # still preloading, the progress bar moves
+        scene = self.scenes.peek("mixing")
+        return self.state == "mixing" and scene is not None and scene.notification.active
+
     # ---------------- Update ----------------
     def update(self):
+        self._update_preload()
         if self.state == "mixing":
             self.mixing_scene.update()
+        if self.state in SCENE_RESOURCES:
+            self.scenes.touch(self.state)
+        self.scenes.release_idle(keep=(self.state,))
+
+    def _update_preload(self):
+        if self.music_started:
+            return
+        progress = self.preloader.progress()
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self.dirty.mark(self.progress_rect.inflate(4, 4))
+        if self.font is None and self.preloader.ready("fonts"):
+            self.font = self.preloader.result("fonts")
+            self.dirty.mark_all()
+        if self.start_button.text == "Loading..." and self.preloader.ready(*SCENE_RESOURCES["level_select"]):
+            self.start_button.text = "Start Mixing"
+            self.dirty.mark(self.start_button.rect)
+        if self.preloader.finished:
+            # Load music
+            load_music("background.ogg")
+            self.music_started = True
+            self.dirty.mark(self.progress_rect.inflate(4, 4))
 
     # ---------------- Draw ----------------
     def draw(self):
-        self.screen.fill((30, 10, 40))
+        """
+        Full mode: redraw everything and return None (caller flips).
+        Dirty mode: repaint only changed regions and return them for
+        pygame.display.update(rects) ([] when nothing changed).
+        """
+        if profiler.overlay_visible and profiler.refresh_overlay(self.screen):
+            self.dirty.mark(profiler.overlay_rect(self.screen))
+
+        if not self.dirty_rendering:
+            self._draw_area(None)
+            self._draw_overlay(None)
+            return None
+
+        rects = self.dirty.consume()
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self._draw_area(rect)
+            self._draw_overlay(rect)
+        self.screen.set_clip(None)
+        return rects
+
+    def _draw_area(self, area):
+        with profiler.scope(f"draw.{self.state}"):
+            self._draw_scene(area)
+
+    def _draw_overlay(self, area):
+        if not profiler.overlay_visible:
+            return
+        if area is None or area.colliderect(profiler.overlay_rect(self.screen)):
+            profiler.draw_overlay(self.screen)
 
+    def _draw_scene(self, area):
         if self.state == "menu":
-            title = self.font.render("Potion Mixer Deluxe", True, (255, 255, 255))
-            self.screen.blit(title, (250, 200))
+            self.screen.fill((30, 10, 40), area)
+            if self.font:
+                title = self.font.render("Potion Mixer Deluxe", True, (255, 255, 255))
+                self.screen.blit(title, (250, 200))
             self.start_button.draw(self.screen)
+            if not self.music_started:
+                self._draw_progress()
 
         elif self.state == "level_select":
-            self.level_select_scene.draw()
+            self.level_select_scene.draw(area)
 
         elif self.state == "mixing":
-            self.mixing_scene.draw()
-            self.back_button.draw(self.screen)
+            self.mixing_scene.draw(area)
+            if area is None or area.colliderect(self.back_button.rect):
+                self.back_button.draw(self.screen)
+
+    def _draw_progress(self):
+        done, total = self.preloader.progress()
+        pygame.draw.rect(self.screen, (80, 60, 100), self.progress_rect, border_radius=6)
+        fill = self.progress_rect.copy()
+        fill.w = fill.w * done // max(1, total)
+        if fill.w:
+            pygame.draw.rect(self.screen, (200, 170, 255), fill, border_radius=6)
@@ -1,16 +1,35 @@
 import os, json, pygame
-from game.ui import Button
-from game.assets_loader import load_font
+from game.ui import Button, DirtyRegions, text_cache
+from game.assets_loader import load_font, release
+from game.levels import LevelRepository
 
 class LevelSelectScene:
-    def __init__(self, screen, small_font, levels_path="data/levels"):
+    """
+    Paged level grid. Only the current page's buttons exist; level numbers
+    come from the LevelRepository listing, so no level file is opened
+    until a level is started, however large the pack is.
+    """
+    PER_ROW = 3
+    START_X, START_Y = 120, 160
+    COL_WIDTH, ROW_HEIGHT = 220, 70
+
+    def __init__(self, screen, small_font, levels_path="data/levels", dirty=None):
         self.screen = screen
+        # regions to repaint when the game runs in dirty-rect mode
+        self.dirty = dirty or DirtyRegions(screen.get_rect())
         self.font = load_font(size=48)
         self.small_font = small_font
         self.levels_path = levels_path
 
-        # Buttons and data
+        # Buttons and data (level_buttons holds the current page only)
         self.level_buttons = []
+        self._page_levels = []
+        self.page = 0
+        rows = max(1, (screen.get_height() - self.START_Y - 100) // self.ROW_HEIGHT)
+        self.page_size = self.PER_ROW * rows
+        nav_y = screen.get_height() - 80
+        self.prev_button = Button("< Prev", self.START_X, nav_y, 120, 44, small_font)
+        self.next_button = Button("Next >", self.START_X + 520, nav_y, 120, 44, small_font)
         self.back_button = Button("Back", 20, 20, 120, 40, small_font)
         self.reset_button = Button("Reset Stats", 20, 70, 200, 40, small_font)
 
@@ -18,12 +37,17 @@ class LevelSelectScene:
         self.stats_path = os.path.join("data", "level_stats.json")
         self.stats = self._load_stats()
 
-        # Load all level files
-        self.level_files = sorted(
-            [f for f in os.listdir(levels_path) if f.lower().endswith(".json")]
-        )
+        # Level numbers from the shared manifest (listed once, not per visit)
+        self.levels = LevelRepository.get(levels_path)
+        self.level_numbers = self.levels.numbers()
         self._create_buttons()
 
+    def close(self):
+        """Give the shared title font and button images back when this scene is dropped."""
+        release(self.font)
+        for btn in self.level_buttons + [self.prev_button, self.next_button, self.back_button, self.reset_button]:
+            btn.close()
+
     # --- Persistent stats helpers ---
     def _load_stats(self):
         if os.path.exists(self.stats_path):
@@ -55,35 +79,57 @@ class LevelSelectScene:
             level_info["best_retries"] = retry_count
             self.stats["levels"][key] = level_info
             self._save_stats()
-            self._create_buttons()  # refresh labels
+            # only that level's label changes (and only if it is on screen)
+            if level_num in self._page_levels:
+                btn = self.level_buttons[self._page_levels.index(level_num)]
+                btn.text = self._label(level_num)
+                self.dirty.mark(btn.rect)
 
     # allow GameManager to manually refresh after other changes if needed
     def refresh(self):
+        self.level_numbers = self.levels.numbers()
         self._create_buttons()
 
-    # --- UI ---
-    def _create_buttons(self):
-        self.level_buttons.clear()
-        start_x, start_y = 120, 160
-        col_width, row_height = 220, 70
-        per_row = 3
+    # --- Paging ---
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.level_numbers) // self.page_size))
 
-        for idx, filename in enumerate(self.level_files):
-            level_num = int("".join([c for c in filename if c.isdigit()]) or 0)
-            label = f"Level {level_num}"
+    def set_page(self, page):
+        page = max(0, min(page, self.page_count - 1))
+        if page != self.page:
+            self.page = page
+            self._create_buttons()
 
-            key = str(level_num)
-            level_info = self.stats["levels"].get(key, {})
-            best = level_info.get("best_retries")
+    def show_level(self, level_num):
+        """Turn to the page holding a level (e.g. the one just played)."""
+        if level_num in self.level_numbers:
+            self.set_page(self.level_numbers.index(level_num) // self.page_size)
 
-            if best is not None:
-                label += f" (Best {best})"
+    # --- UI ---
+    def _label(self, level_num):
+        label = f"Level {level_num}"
+        best = self.stats["levels"].get(str(level_num), {}).get("best_retries")
+        if best is not None:
+            label += f" (Best {best})"
+        return label
 
-            row = idx // per_row
-            col = idx % per_row
-            x = start_x + col * col_width
-            y = start_y + row * row_height
-            self.level_buttons.append(Button(label, x, y, 200, 50, self.small_font))
+    def _create_buttons(self):
+        """Build buttons for the current page's levels only."""
+        self.page = max(0, min(self.page, self.page_count - 1))
+        first = self.page * self.page_size
+        self._page_levels = self.level_numbers[first:first + self.page_size]
+        for btn in self.level_buttons:
+            btn.close()
+        self.level_buttons.clear()
+        self.dirty.mark_all()
+
+        for idx, level_num in enumerate(self._page_levels):
+            row = idx // self.PER_ROW
+            col = idx % self.PER_ROW
+            x = self.START_X + col * self.COL_WIDTH
+            y = self.START_Y + row * self.ROW_HEIGHT
+            self.level_buttons.append(Button(self._label(level_num), x, y, 200, 50, self.small_font))
 
     def reset_stats(self):
         # Completely wipe stats
@@ -92,32 +138,61 @@ class LevelSelectScene:
         self._create_buttons()
         print("Level stats reset!")
 
+    def buttons(self):
+        """Every button currently on screen (for hover tracking)."""
+        btns = self.level_buttons + [self.back_button, self.reset_button]
+        if self.page_count > 1:
+            btns += [self.prev_button, self.next_button]
+        return btns
+
     # --- Event ---
     def handle_event(self, event, game_manager):
+        # Paging: mouse wheel, arrow keys / Page Up / Page Down
+        if event.type == pygame.MOUSEWHEEL:
+            self.set_page(self.page - event.y)
+            return
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+                self.set_page(self.page - 1)
+            elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+                self.set_page(self.page + 1)
+            return
+
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.back_button.is_clicked(event):
-                game_manager.state = "menu"
+                game_manager.set_state("menu")
                 return
             
             if self.reset_button.is_clicked(event):
                 self.reset_stats()
                 return
 
+            if self.page_count > 1:
+                if self.prev_button.is_clicked(event):
+                    self.set_page(self.page - 1)
+                    return
+                if self.next_button.is_clicked(event):
+                    self.set_page(self.page + 1)
+                    return
+
             for idx, btn in enumerate(self.level_buttons):
                 if btn.is_clicked(event):
-                    filename = self.level_files[idx]
-                    level_num = int("".join([c for c in filename if c.isdigit()]) or 0)
-                    game_manager.start_level(level_num)
+                    game_manager.start_level(self._page_levels[idx])
                     return
 
     # --- Draw ---
-    def draw(self):
-        self.screen.fill((20, 10, 30))
+    def draw(self, area=None):
+        """Draw the scene; with an area only buttons touching that rect are redrawn."""
+        self.screen.fill((20, 10, 30), area)
         title = self.font.render("Select a Level", True, (255, 255, 255))
         self.screen.blit(title, (260, 60))
 
-        for btn in self.level_buttons:
-            btn.draw(self.screen)
+        for btn in self.buttons():
+            if area is None or area.colliderect(btn.rect):
+                btn.draw(self.screen)
 
-        self.back_button.draw(self.screen)
-        self.reset_button.draw(self.screen)
\ No newline at end of file
+        if self.page_count > 1:
+            label = text_cache.render(self.small_font, f"Page {self.page + 1} / {self.page_count}",
+                                      (255, 255, 255))
+            center_x = (self.prev_button.rect.right + self.next_button.rect.left) // 2
+            self.screen.blit(label, label.get_rect(center=(center_x, self.next_button.rect.centery)))
\ No newline at end of file
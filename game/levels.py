@@ -0,0 +1,135 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+LEVEL_FILE = re.compile(r"level(\d+)\.json$", re.IGNORECASE)
+
+
+class LevelInfo(NamedTuple):
+    """Manifest entry for one level file."""
+    number: int
+    path: str
+    objective: str
+    target_potion: Optional[str]
+    ingredients: Tuple[str, ...]
+    mtime_ns: int
+
+
+def _info(number: int, path: str, data: dict, mtime_ns: int) -> LevelInfo:
+    names = tuple(
+        ing.get("name") if isinstance(ing, dict) else str(ing)
+        for ing in data.get("ingredients", [])
+    )
+    return LevelInfo(
+        number, path,
+        data.get("objective", "Unknown objective"),
+        data.get("target_potion") or data.get("objective_potion"),
+        tuple(n for n in names if n),
+        mtime_ns,
+    )
+
+
+class LevelRepository:
+    """
+    Every levelN.json in a directory, parsed at most once per file version.
+    The directory is listed once (rescan() picks up added or deleted files);
+    each level is parsed the first time it is asked for and served from
+    memory after that, unless its mtime changed, in which case only that
+    entry is re-read. Parsed level data is shared: treat it as read-only.
+    """
+    _instances: Dict[str, "LevelRepository"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, levels_dir: str = os.path.join("data", "levels")):
+        self.levels_dir = levels_dir
+        self._paths: Optional[Dict[int, str]] = None
+        # level number -> (LevelInfo, parsed data)
+        self._entries: Dict[int, Tuple[LevelInfo, dict]] = {}
+        self._entry_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, levels_dir: str = os.path.join("data", "levels")) -> "LevelRepository":
+        """The shared repository for a directory (one per absolute path)."""
+        key = os.path.abspath(levels_dir)
+        with cls._lock:
+            repo = cls._instances.get(key)
+            if repo is None:
+                repo = cls._instances[key] = cls(levels_dir)
+            return repo
+
+    # ---------------- Directory ----------------
+    def rescan(self) -> None:
+        """List the directory again (new or deleted level files)."""
+        paths = {}
+        if os.path.isdir(self.levels_dir):
+            for filename in os.listdir(self.levels_dir):
+                m = LEVEL_FILE.match(filename)
+                if m:
+                    paths[int(m.group(1))] = os.path.join(self.levels_dir, filename)
+        with self._entry_lock:
+            self._paths = paths
+            for number in [n for n in self._entries if n not in paths]:
+                del self._entries[number]
+
+    def _listing(self) -> Dict[int, str]:
+        if self._paths is None:
+            self.rescan()
+        return self._paths
+
+    def numbers(self) -> List[int]:
+        """Every level number, ascending (no file is opened)."""
+        return sorted(self._listing())
+
+    def __len__(self) -> int:
+        return len(self._listing())
+
+    def __contains__(self, number) -> bool:
+        return number in self._listing()
+
+    # ---------------- Levels ----------------
+    def _entry(self, number: int) -> Optional[Tuple[LevelInfo, dict]]:
+        path = self._listing().get(number)
+        if path is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        entry = self._entries.get(number)
+        if entry is not None and entry[0].mtime_ns == mtime:
+            return entry
+
+        with open(path, "r") as f:
+            data = json.load(f)
+        entry = (_info(number, path, data, mtime), data)
+        with self._entry_lock:
+            self._entries[number] = entry
+        return entry
+
+    def load(self, number: int) -> Optional[dict]:
+        """Parsed level data, None if there is no such level."""
+        entry = self._entry(number)
+        return entry[1] if entry else None
+
+    def info(self, number: int) -> Optional[LevelInfo]:
+        entry = self._entry(number)
+        return entry[0] if entry else None
+
+    def manifest(self) -> List[LevelInfo]:
+        """LevelInfo for every level, ascending by number (parses any not read yet)."""
+        return [info for info in map(self.info, self.numbers()) if info is not None]
+
+    def invalidate(self, number: Optional[int] = None) -> None:
+        """Forget one parsed level (or all of them) so the next load re-reads it."""
+        with self._entry_lock:
+            if number is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(number, None)
+
+    def preload(self) -> int:
+        """List the level files (run on a loader thread at startup); nothing is parsed."""
+        self.rescan()
+        return len(self._paths)
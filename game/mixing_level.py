@@ -1,16 +1,33 @@
-import os, json
 from game.PotionMixerCommand import Inventory
+from game.levels import LevelRepository
+
 
 def load_level_data(level_number):
-    level_path = os.path.join("data", "levels", f"level{level_number}.json")
-    if not os.path.exists(level_path):
-        print(f"Level file not found: {level_path}")
-        return None
+    """Parsed level JSON from the shared LevelRepository (read-only), or None."""
+    data = LevelRepository.get().load(level_number)
+    if data is None:
+        print(f"Level file not found: level{level_number}.json")
+    return data
 
-    with open(level_path, "r") as f:
-        data = json.load(f)
 
-    return data
+def preload_levels():
+    """List the level files up front (run on a loader thread at startup); each is parsed on first load."""
+    return LevelRepository.get().preload()
+
+
+# Utility: map category (solid/liquid/essence/potion) to inventory kind
+CATEGORY_TO_KIND = {
+    "liquid": "fluids",
+    "solid": "solids",
+    "essence": "essences",
+    "potion": "potions",
+}
+KIND_TO_CATEGORY = {v: k for k, v in CATEGORY_TO_KIND.items()}
+
+
+def kind_for(cat: str) -> str:
+    return CATEGORY_TO_KIND.get(cat, "solids")
+
 
 def build_inventory_from_level(data):
     inv = Inventory()
@@ -18,14 +35,6 @@ def build_inventory_from_level(data):
 
     raw_ings = data.get("ingredients", [])
 
-    def kind_for(cat: str) -> str:
-        return {
-            "liquid": "fluids",
-            "solid": "solids",
-            "essence": "essences",
-            "potion": "potions",
-        }.get(cat, "solids")
-
     for ing in raw_ings:
         if isinstance(ing, dict):
             name = ing.get("name")
@@ -6,9 +6,11 @@ def handle_popup_event(scene, event):
     if event.type != pygame.MOUSEBUTTONDOWN or not hasattr(event, "pos"):
         return
 
-    # Close
+    # Close: the station's slotted items go back to the inventory
     if scene.popup.close_btn.is_clicked(event):
+        scene.session.clear_station(scene.popup.station_name)
         scene.popup = None
+        scene.layout_ingredient_buttons()
         return
 
     # Mix
@@ -22,17 +24,13 @@ def handle_popup_event(scene, event):
         if not slot_rect.collidepoint(pos):
             continue
         station = scene.popup.station_name
-        reqs = scene.station_slot_requirements.get(station, [])
-        expected = reqs[i] if i < len(reqs) else None
         slots = scene.station_slots[station]
 
         if slots[i]:
             # remove from slot -> give back to inventory
-            name = slots[i]
-            cat = scene.ingredient_category.get(name, expected or "solid")
-            scene.inventory.add_to_inventory(name, scene._kind_for(cat), 1)
-            slots[i] = None
+            scene.session.remove(station, i)
             scene.popup.slots = slots
+            scene.dirty.mark(scene.popup.rect)
             scene.layout_ingredient_buttons()
             scene.sfx_click.play()
             continue
@@ -43,23 +41,14 @@ def handle_popup_event(scene, event):
             scene.sfx_error.play()
             return
 
-        sel_name = scene.selected_ingredient
-        sel_cat = scene.ingredient_category.get(sel_name, None)
-        if expected and expected != sel_cat:
-            scene.notification.set(f"Needs {expected}", 1.4)
-            scene.sfx_error.play()
-            return
-
-        kind = scene._kind_for(sel_cat or expected or "solid")
-        if not scene.inventory.check_inventory(sel_name, kind):
-            scene.notification.set("Out of stock", 1.2)
+        outcome = scene.session.place(station, i, scene.selected_ingredient)
+        if not outcome.ok:
+            scene.notification.set(outcome.message, 1.4)
             scene.sfx_error.play()
             return
 
-        # consume and place
-        scene.inventory.remove_from_inventory(sel_name, kind, 1)
-        slots[i] = sel_name
         scene.popup.slots = slots
+        scene.dirty.mark(scene.popup.rect)
         scene.selected_ingredient = None
         scene.layout_ingredient_buttons()
         scene.sfx_click.play()
@@ -1,15 +1,21 @@
 import pygame
-from collections import Counter
-from game.ui import Button, Notification
-from game.assets_loader import load_font, load_sound
-from game.PotionMixerCommand import Inventory, Mixing, ReservedInventoryView
-from game.mixing_level import load_level_data, build_inventory_from_level
+from game.ui import Button, Notification, DirtyRegions
+from game.profiler import profiler
+from game.assets_loader import load_font, load_sound, release
+from game.mixing_level import load_level_data, kind_for
 from game.mixing_popup import open_station_popup, handle_popup_event
+from game.session import GameSession, STATION_NAMES, STATION_SLOT_REQUIREMENTS
 
 
 class MixingScene:
-    def __init__(self, screen, small_font):
+    def __init__(self, screen, small_font, dirty=None):
         self.screen = screen
+        # regions to repaint when the game runs in dirty-rect mode
+        self.dirty = dirty or DirtyRegions(screen.get_rect())
+        w = screen.get_width()
+        self.status_area = pygame.Rect(0, 78, w, 30)        # "Selected:" and retries
+        self.tab_area = pygame.Rect(30, 104, 580, 48)
+        self.ingredient_area = pygame.Rect(0, 152, w, 324)  # everything between tabs and stations
         self.font = load_font(size=48)
         self.small_font = small_font
 
@@ -19,29 +25,20 @@ class MixingScene:
         self.sfx_mix = load_sound("mix.wav")
         self.sfx_success = load_sound("success.wav")
 
-        # Inventory + recipe logic
-        self.inventory = Inventory()
-        self.mixing = Mixing()
-
-        # categories: mapping ingredient_name -> category (solid/liquid/essence/potion)
-        self.ingredient_category = {}
+        # All game rules live in the headless session; this scene only draws it
+        self.session = GameSession()
 
         # UI state
         self.max_slots = 3
-        self.popup = None
-        self.selected_ingredient = None
+        self._popup = None
+        self._selected_ingredient = None
         self.ingredient_buttons = []
 
         # Level control
-        self.current_level = 1
-        self.objective = "Brew something magical!"
-        self.level_complete_flag = False
-        self.target_potion = None
         self.on_level_complete = None
-
+        self.stations = []
 
         # Retry counter
-        self.retry_count = 0
         self.retry_button = Button("Retry Level", 420, 550, 160, 50, self.small_font)
 
         # Next level button
@@ -58,90 +55,157 @@ class MixingScene:
             self.tab_buttons.append(b)
 
         # station slot rules per station: list of expected categories for each slot
-        self.station_slot_requirements = {
-            "Retort": ["liquid"],
-            "Mortar": ["solid"],
-            "Calcinator": ["solid", "solid"],
-            "Cauldron": ["liquid", "solid", "essence"],
-            "Alembic": ["liquid", "essence"],
-            "Infuser": ["solid", "liquid"],
-            "Magic Wand": ["essence", "essence"],
-        }
+        self.station_slot_requirements = STATION_SLOT_REQUIREMENTS
 
         # temporary on-screen notification (message, until_time)
         self.notification = Notification(self.small_font)
 
-    # ---------------- Retry level ----------------
-    def retry_level(self):
-        # bump counter and fully reload the same level
-        self.retry_count += 1
-        self.sfx_click.play()
-        # close any open popup and selection to avoid weird state
+    def close(self):
+        """Give shared assets back to the registry when this scene is dropped."""
+        for asset in (self.font, self.sfx_click, self.sfx_error, self.sfx_mix, self.sfx_success):
+            release(asset)
+        for btn in self.tab_buttons + self.ingredient_buttons + self.stations:
+            btn.close()
+        self.retry_button.close()
+        self.next_level_button.close()
         self.popup = None
+
+    # ---------------- Session state (read through to GameSession) ----------------
+    @property
+    def inventory(self):
+        return self.session.inventory
+
+    @property
+    def ingredient_category(self):
+        return self.session.ingredient_category
+
+    @property
+    def station_slots(self):
+        return self.session.station_slots
+
+    @property
+    def current_level(self):
+        return self.session.current_level
+
+    @property
+    def objective(self):
+        return self.session.objective
+
+    @property
+    def target_potion(self):
+        return self.session.target_potion
+
+    @property
+    def level_complete_flag(self):
+        return self.session.complete
+
+    @level_complete_flag.setter
+    def level_complete_flag(self, value):
+        self.session.complete = value
+
+    @property
+    def retry_count(self):
+        return self.session.retry_count
+
+    @retry_count.setter
+    def retry_count(self, value):
+        self.session.retry_count = value
+
+    # ---------------- UI state that marks itself dirty ----------------
+    @property
+    def popup(self):
+        return self._popup
+
+    @popup.setter
+    def popup(self, value):
+        if self._popup is not None:
+            self.dirty.mark(self._popup.rect)
+            if value is not self._popup:
+                self._popup.close()
+        if value is not None:
+            self.dirty.mark(value.rect)
+        self._popup = value
+
+    @property
+    def selected_ingredient(self):
+        return self._selected_ingredient
+
+    @selected_ingredient.setter
+    def selected_ingredient(self, value):
+        if value != self._selected_ingredient:
+            for b in self.ingredient_buttons:
+                if b.meta_name in (value, self._selected_ingredient):
+                    self.dirty.mark(b.rect.inflate(8, 8))
+            self.dirty.mark(self.status_area)
+        self._selected_ingredient = value
+
+    def buttons(self):
+        """Every button currently on screen (for hover tracking)."""
+        btns = self.tab_buttons + self.ingredient_buttons + self.stations + [self.retry_button]
+        if self.level_complete_flag:
+            btns.append(self.next_level_button)
+        if self.popup:
+            btns += [self.popup.mix_btn, self.popup.close_btn]
+        return btns
+
+    def _reset_ui(self):
+        # close any open popup and selection to avoid weird state
+        for btn in self.ingredient_buttons:
+            btn.close()
+        self.ingredient_buttons = []
         self.selected_ingredient = None
-        # reload restores initial ingredients & stations
-        self.load_level(self.current_level)
+        self.popup = None
+        self.active_tab = ""
 
-    # ---------------- Check objective ----------------
-    def _check_objective(self):
-        """If target_potion is owned, mark level complete and celebrate once."""
-        if not self.target_potion:
-            return
+    # ---------------- Retry level ----------------
+    def retry_level(self):
+        # bump counter and restore the level's initial ingredients & slots
+        self.session.retry()
+        self.sfx_click.play()
+        self._reset_ui()
+        self.layout_ingredient_buttons()
+        self.dirty.mark_all()
 
-        have = self.inventory.potions.get(self.target_potion, 0)
-        if have > 0 and not self.level_complete_flag:
-            # mark level complete
-            self.level_complete_flag = True
-            self.sfx_success.play()
-            self.notification.set(
-                f"Level complete! Brewed {self.target_potion}!", 2.5
-            )
+    # ---------------- Level complete ----------------
+    def _celebrate(self):
+        """Called once when the session reports the target potion was brewed."""
+        self.sfx_success.play()
+        self.next_level_button.sync_hover()
+        self.dirty.mark(self.next_level_button.rect)
+        self.notification.set(
+            f"Level complete! Brewed {self.target_potion}!", 2.5
+        )
 
-            # notify GameManager / LevelSelectScene
-            if callable(self.on_level_complete):
-                self.on_level_complete(self.current_level, self.retry_count)
+        # notify GameManager / LevelSelectScene
+        if callable(self.on_level_complete):
+            self.on_level_complete(self.current_level, self.retry_count)
 
 
     # ---------------- Load Level ----------------
     def load_level(self, level_number):
         # reset per-level state
-        self.inventory = Inventory()
-        self.ingredient_category = {}
-        self.ingredient_buttons = []
-        self.selected_ingredient = None
-        self.popup = None
+        self._reset_ui()
         self.level_complete_flag = False
-        self.active_tab = ""
+        self.dirty.mark_all()
 
         data = load_level_data(level_number)
         if data is None:
+            self.session.clear()
             return
 
-        self.current_level = data.get("level", level_number)
-        self.objective = data.get("objective", "Unknown objective")
-        self.target_potion = data.get("target_potion") or data.get("objective_potion")
-
-        # build inventory + categories via helper
-        self.inventory, self.ingredient_category = build_inventory_from_level(data)
+        self.session.load(data, level_number)
 
         # stations always the same
         start_x = 40
         spacing = 130
         y_pos = 480
-        all_station_names = [
-            "Retort", "Mortar", "Calcinator", "Cauldron",
-            "Alembic", "Infuser", "Magic Wand"
-        ]
+        for btn in self.stations:
+            btn.close()
         self.stations = [
             Button(name, start_x + i * spacing, y_pos, 120, 60, self.small_font)
-            for i, name in enumerate(all_station_names)
+            for i, name in enumerate(STATION_NAMES)
         ]
 
-        self.station_slots = {}
-        for s in self.stations:
-            reqs = self.station_slot_requirements.get(s.text, [])
-            self.station_slots[s.text] = [None for _ in reqs]
-
         print(f"Loaded Level {self.current_level}: {self.objective}")
         self.layout_ingredient_buttons()
 
@@ -149,8 +213,15 @@ class MixingScene:
     # ---------------- Layout Ingredients ----------------
     def layout_ingredient_buttons(self):
         """Rebuild ingredient buttons based on the active tab and current inventory."""
+        with profiler.scope("layout_ingredients"):
+            self._layout_ingredient_buttons()
+
+    def _layout_ingredient_buttons(self):
         key = self.active_tab
+        for btn in self.ingredient_buttons:
+            btn.close()
         self.ingredient_buttons = []
+        self.dirty.mark(self.ingredient_area)
         if not key:
             return
 
@@ -164,11 +235,6 @@ class MixingScene:
         kind = key_to_kind[key]
         items = self.inventory.get_items(kind)
 
-        tab_cat = key  # "solid", "liquid", "essence", "potion"
-        for nm, _ct in items:
-            if nm not in self.ingredient_category:
-                self.ingredient_category[nm] = tab_cat
-
         max_per_row = 6
         row_height = 60
         col_width = 150
@@ -205,23 +271,28 @@ class MixingScene:
     # Utility: map category to inventory kind
     @staticmethod
     def _kind_for(cat: str) -> str:
-        return {
-            "liquid": "fluids",
-            "solid": "solids",
-            "essence": "essences",
-            "potion": "potions",
-        }.get(cat, "solids")
+        return kind_for(cat)
 
     # ---------------- Event Handling ----------------
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             return
 
+        # Undo / redo: Ctrl+Z, Ctrl+Y (or Ctrl+Shift+Z)
+        if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+            if event.key == pygame.K_z and not event.mod & pygame.KMOD_SHIFT:
+                self.undo()
+                return
+            if event.key in (pygame.K_y, pygame.K_z):
+                self.redo()
+                return
+
         # Tabs
         if event.type == pygame.MOUSEBUTTONDOWN:
             for i, tb in enumerate(self.tab_buttons):
                 if tb.is_clicked(event):
                     self.active_tab = self.tab_keys[i]
+                    self.dirty.mark(self.tab_area)
                     self.layout_ingredient_buttons()
                     return
 
@@ -275,61 +346,57 @@ class MixingScene:
 
     # ---------------- Mixing ----------------
     def mix_station(self, station_name):
-        slots = self.station_slots[station_name]
-        if any(s is None for s in slots):
-            self.notification.set("Fill all slots before mixing!", 1.6)
+        outcome = self.session.mix(station_name)
+        if not outcome.ok:
+            self.notification.set(outcome.message, 1.6)
             self.sfx_error.play()
             return
 
-        # Build reserved counts from what’s in the slots
-        reserved = {"fluids": Counter(), "solids": Counter(), "essences": Counter(), "potions": Counter()}
-        for s in slots:
-            cat = self.ingredient_category.get(s, "solid")
-            kind = self._kind_for(cat)  # returns "fluids"/"solids"/"essences"/"potions"
-            reserved[kind][s] += 1
-
-        inv_view = ReservedInventoryView(self.inventory, reserved)
-
-        # Call the same Mixing methods, but pass the view
-        try:
-            if station_name == "Mortar":
-                result_msg = self.mixing.Mortar(inv_view, slots[0])
-            elif station_name == "Calcinator":
-                result_msg = self.mixing.Calcinator(inv_view, slots[0], slots[1])
-            elif station_name == "Alembic":
-                result_msg = self.mixing.Alembic(inv_view, slots[0], slots[1])
-            elif station_name == "Infuser":
-                result_msg = self.mixing.Infuser(inv_view, slots[0], slots[1])
-            elif station_name == "Magic Wand":
-                result_msg = self.mixing.Magic_Wand(inv_view, slots[0], slots[1])
-            elif station_name == "Cauldron":
-                result_msg = self.mixing.Cauldron(inv_view, slots[0], slots[1], slots[2])
-            elif station_name == "Retort":
-                result_msg = self.mixing.Retort(inv_view, slots[0])
-            else:
-                result_msg = f"Unknown station: {station_name}"
-        except Exception as e:
-            result_msg = f"Mixing error: {e}"
-
         self.sfx_mix.play()
-
-        # Clear used slots (items already removed when slotted; view just made them visible to the mixer)
-        self.station_slots[station_name] = [None for _ in slots]
         self.popup = None
+        self.notification.set(outcome.message, 2.5)
+        self.layout_ingredient_buttons()
+        if outcome.completed:
+            self._celebrate()
+
+
+    # ---------------- Undo / redo ----------------
+    def undo(self):
+        self._apply_history(self.session.undo())
+
+    def redo(self):
+        self._apply_history(self.session.redo())
+
+    def _apply_history(self, outcome):
+        if not outcome.ok:
+            self.notification.set(outcome.message, 1.2)
+            self.sfx_error.play()
+            return
 
-        self.notification.set(result_msg, 2.5)
-        self.inventory.cleanup()
+        self.sfx_click.play()
+        if self.popup:
+            self.popup.slots = list(self.station_slots[self.popup.station_name])
+            self.dirty.mark(self.popup.rect)
+        self.next_level_button.sync_hover()
+        self.dirty.mark(self.next_level_button.rect)
+        self.notification.set(outcome.message, 1.2)
         self.layout_ingredient_buttons()
-        self._check_objective()
+        if outcome.completed:
+            self._celebrate()
 
 
     # ---------------- Update ----------------
     def update(self):
-        pass
+        self.notification.update()
+        if self.notification.changed:
+            self.notification.changed = False
+            self.dirty.mark(self.notification.area(self.screen))
 
     # ---------------- Draw ----------------
-    def draw(self):
-        self.screen.fill((30, 10, 40))
+    def draw(self, area=None):
+        """Draw the scene; with an area only widgets touching that rect are redrawn."""
+        self.screen.fill((30, 10, 40), area)
+        visible = (lambda rect: True) if area is None else area.colliderect
 
         # Objective
         objective_text = self.small_font.render(f"Objective: {self.objective}", True, (255, 255, 255))
@@ -338,12 +405,16 @@ class MixingScene:
         # Tabs
         for i, tb in enumerate(self.tab_buttons):
             key = self.tab_keys[i]
+            if not visible(tb.rect):
+                continue
             if self.active_tab == key:
                 pygame.draw.rect(self.screen, (70, 70, 120), tb.rect, border_radius=6)
             tb.draw(self.screen)
 
         # Ingredients
         for b in self.ingredient_buttons:
+            if not visible(b.rect.inflate(6, 6)):
+                continue
             real_name = getattr(b, "meta_name", b.text.split(" x")[0])
             if self.selected_ingredient == real_name:
                 pygame.draw.rect(self.screen, (255, 215, 0), b.rect.inflate(6, 6), border_radius=8)
@@ -352,10 +423,12 @@ class MixingScene:
 
         # Stations
         for st in self.stations:
-            st.draw(self.screen)
+            if visible(st.rect):
+                st.draw(self.screen)
 
         # Retry
-        self.retry_button.draw(self.screen)
+        if visible(self.retry_button.rect):
+            self.retry_button.draw(self.screen)
         retries_text = self.small_font.render(f"Retries: {self.retry_count}", True, (255, 255, 255))
         self.screen.blit(retries_text, (500, 80))
 
@@ -365,11 +438,11 @@ class MixingScene:
         self.screen.blit(status, (40, 85))
 
         # Popup
-        if self.popup:
+        if self.popup and visible(self.popup.rect):
             self.popup.draw()
 
         # Next Level (kept from original; you may gate this by objective later)
-        if self.level_complete_flag:
+        if self.level_complete_flag and visible(self.next_level_button.rect):
             self.next_level_button.draw(self.screen)
 
         # Notification
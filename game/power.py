@@ -0,0 +1,57 @@
+import os
+import pygame
+
+
+class PowerPolicy:
+    """
+    How hard the main loop works.
+    - active_fps: frame cap while something is animating (notifications,
+      loading) or input is arriving
+    - idle_wait_ms: when nothing animates, block in pygame.event.wait for
+      up to this long instead of polling (None = never idle)
+    - unfocused_fps / unfocused_wait_ms: the same two knobs while the
+      window is in the background
+    """
+    def __init__(self, active_fps=60, idle_wait_ms=500, unfocused_fps=10, unfocused_wait_ms=2000):
+        self.active_fps = active_fps
+        self.idle_wait_ms = idle_wait_ms
+        self.unfocused_fps = unfocused_fps
+        self.unfocused_wait_ms = unfocused_wait_ms
+
+    def fps(self, focused):
+        return self.active_fps if focused else self.unfocused_fps
+
+    def wait_ms(self, focused):
+        return self.idle_wait_ms if focused else self.unfocused_wait_ms
+
+    def next_events(self, idle, focused):
+        """
+        Events for this frame. When idle, sleep in event.wait until input
+        arrives or the timeout passes (then an empty list is returned).
+        """
+        timeout = self.wait_ms(focused)
+        if idle and timeout is not None:
+            first = pygame.event.wait(timeout)
+            if first.type == pygame.NOEVENT:
+                return []
+            return [first] + pygame.event.get()
+        return pygame.event.get()
+
+
+POWER_POLICIES = {
+    # always poll at full rate (the old behaviour)
+    "performance": PowerPolicy(idle_wait_ms=None, unfocused_fps=60, unfocused_wait_ms=None),
+    "balanced": PowerPolicy(),
+    # kiosk machines: wake rarely, crawl in the background
+    "saver": PowerPolicy(active_fps=30, idle_wait_ms=1000, unfocused_fps=2, unfocused_wait_ms=5000),
+}
+POWER_ENV_VAR = "POTION_POWER_POLICY"
+
+
+def power_policy(name=None):
+    """Policy by name; name=None uses $POTION_POWER_POLICY, falling back to "balanced"."""
+    name = name or os.environ.get(POWER_ENV_VAR) or "balanced"
+    try:
+        return POWER_POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown power policy: {name}") from None
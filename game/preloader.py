@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class Preloader:
+    """
+    Runs named loading tasks on a small worker pool so the first frame can
+    be drawn right away. Scenes ask ready(...) for the tasks they depend on
+    and only wait() if they are needed before they finished.
+    """
+    def __init__(self, max_workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preload")
+        self._futures = {}
+
+    def submit(self, name, fn, *args, **kwargs):
+        self._futures[name] = self._pool.submit(fn, *args, **kwargs)
+
+    def ready(self, *names):
+        """True once every named task has finished (successfully or not)."""
+        return all(self._futures[n].done() for n in names)
+
+    def wait(self, *names):
+        wait([self._futures[n] for n in names])
+
+    def result(self, name):
+        """Task result, blocking until it is done; re-raises a failed task's error."""
+        return self._futures[name].result()
+
+    def progress(self):
+        """(finished, total) task counts."""
+        done = sum(f.done() for f in self._futures.values())
+        return done, len(self._futures)
+
+    @property
+    def finished(self):
+        done, total = self.progress()
+        return done == total
+
+    def errors(self):
+        return {n: f.exception() for n, f in self._futures.items() if f.done() and f.exception()}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,183 @@
+import json
+import time
+from bisect import bisect_left
+from collections import deque
+import pygame
+
+# histogram bucket upper edges in ms (the last bucket is everything slower)
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, 50, 100)
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class FrameProfiler:
+    """
+    Named timing scopes for the main loop:
+
+        with profiler.scope("update"):
+            game.update()
+
+    Each scope keeps the last `window` samples (for rolling p50/p95/p99 in
+    the overlay) and a whole-run histogram (for dump()). When disabled,
+    scope() returns a shared no-op context manager. Other subsystems can
+    add counters (e.g. cache hit rates) that the overlay and dump() show.
+    """
+    def __init__(self, window=240, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.overlay_visible = False
+        self._recent = {}      # name -> deque of ms
+        self._hist = {}        # name -> [count per bucket]
+        self._totals = {}      # name -> [count, total ms, max ms]
+        self._counters = {}    # name -> (stats(), overlay line formatter)
+        self._overlay = None   # cached overlay surface, rebuilt a few times a second
+        self._overlay_at = 0.0
+        self._font = None
+
+    def scope(self, name):
+        return _Scope(self, name) if self.enabled else _NULL_SCOPE
+
+    def record(self, name, ms):
+        recent = self._recent.get(name)
+        if recent is None:
+            recent = self._recent[name] = deque(maxlen=self.window)
+            self._hist[name] = [0] * (len(BUCKET_EDGES_MS) + 1)
+            self._totals[name] = [0, 0.0, 0.0]
+        recent.append(ms)
+        self._hist[name][bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        totals = self._totals[name]
+        totals[0] += 1
+        totals[1] += ms
+        if ms > totals[2]:
+            totals[2] = ms
+
+    def percentiles(self, name, qs=(50, 95, 99)):
+        """Rolling percentiles (ms) of the last `window` samples of a scope."""
+        samples = sorted(self._recent.get(name, ()))
+        if not samples:
+            return tuple(0.0 for _ in qs)
+        last = len(samples) - 1
+        return tuple(samples[min(last, int(round(q / 100 * last)))] for q in qs)
+
+    def names(self):
+        return list(self._recent)
+
+    def add_counters(self, name, stats, line=None):
+        """
+        Report a subsystem's counters: stats() returns a JSON-friendly dict
+        (written by dump()); line(stats) formats it for the overlay.
+        """
+        self._counters[name] = (stats, line or (lambda s: " ".join(f"{k}={v}" for k, v in s.items())))
+
+    def counters(self):
+        return {name: stats() for name, (stats, _line) in self._counters.items()}
+
+    def reset(self):
+        self._recent.clear()
+        self._hist.clear()
+        self._totals.clear()
+        self._overlay = None
+
+    # ---------------- Report ----------------
+    def summary(self):
+        """{scope: {"count", "mean_ms", "max_ms", "p50_ms", "p95_ms", "p99_ms", "histogram"}}."""
+        labels = [f"<={e}" for e in BUCKET_EDGES_MS] + [f">{BUCKET_EDGES_MS[-1]}"]
+        out = {}
+        for name in sorted(self._recent):
+            count, total, worst = self._totals[name]
+            p50, p95, p99 = self.percentiles(name)
+            out[name] = {
+                "count": count,
+                "mean_ms": total / count if count else 0.0,
+                "max_ms": worst,
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+                "histogram": dict(zip(labels, self._hist[name])),
+            }
+        return out
+
+    def dump(self, path):
+        """Write summary() as JSON (percentiles are over the last window, histograms over the run)."""
+        with open(path, "w") as f:
+            json.dump({"bucket_edges_ms": BUCKET_EDGES_MS, "scopes": self.summary(),
+                       "counters": self.counters()}, f, indent=2)
+        print(f"Frame profile written to {path}")
+
+    # ---------------- Overlay ----------------
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self._overlay = None
+
+    def overlay_rect(self, screen):
+        """Where the overlay goes (top-right corner), so dirty rendering can repaint it."""
+        w, h = 330, 16 * (12 + len(self._counters)) + 10
+        return pygame.Rect(screen.get_width() - w - 8, 70, w, h)
+
+    def refresh_overlay(self, screen, every=0.25):
+        """Re-render the overlay's numbers if they are older than `every` s; True if they changed."""
+        now = time.perf_counter()
+        if self._overlay is not None and now - self._overlay_at < every:
+            return False
+        self._overlay = self._build_overlay(self.overlay_rect(screen).size)
+        self._overlay_at = now
+        return True
+
+    def draw_overlay(self, screen):
+        if self._overlay is None:
+            self.refresh_overlay(screen)
+        screen.blit(self._overlay, self.overlay_rect(screen))
+
+    def _build_overlay(self, size):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 190))
+        rows = [("scope", "p50", "p95", "p99 ms")]
+        # frame first, then everything else alphabetically
+        names = sorted(self._recent, key=lambda n: (n != "frame", n))
+        for name in names[:11]:
+            rows.append((name, *(f"{v:.2f}" for v in self.percentiles(name))))
+        y = 5
+        for row in rows:
+            # the default font isn't monospaced: name left-aligned, numbers right-aligned
+            surf.blit(self._font.render(row[0], True, (180, 255, 180)), (6, y))
+            for i, col in enumerate(row[1:]):
+                text = self._font.render(col, True, (180, 255, 180))
+                surf.blit(text, (180 + 70 * i - text.get_width(), y))
+            y += 16
+        for name, (stats, line) in self._counters.items():
+            surf.blit(self._font.render(f"{name}: {line(stats())}", True, (255, 230, 150)), (6, y))
+            y += 16
+        return surf
+
+
+# the game's single profiler
+profiler = FrameProfiler()
@@ -0,0 +1,77 @@
+import os
+import pickle
+import tempfile
+from game.recipes import RecipeIndex, STATION_TABLES
+
+# Bump whenever the on-disk layout or the RecipeIndex key format changes
+DB_VERSION = 1
+DB_MAGIC = b"PMXRDB"
+DEFAULT_DB_NAME = "recipes.db"
+
+
+def _source_manifest(data_dir: str) -> dict:
+    """(mtime_ns, size) of every recipe CSV, used to detect stale databases."""
+    manifest = {}
+    for filename, _in_cols, _out_cols in STATION_TABLES.values():
+        st = os.stat(os.path.join(data_dir, filename))
+        manifest[filename] = (st.st_mtime_ns, st.st_size)
+    return manifest
+
+
+def _header(data_dir: str) -> dict:
+    return {"version": DB_VERSION, "sources": _source_manifest(data_dir)}
+
+
+def compile_recipe_db(data_dir: str = "data", db_path: str = None) -> RecipeIndex:
+    """Parse the CSVs once and write them out as a single binary recipe database."""
+    db_path = db_path or os.path.join(data_dir, DEFAULT_DB_NAME)
+    header = _header(data_dir)
+    index = RecipeIndex.from_csv_dir(data_dir)
+
+    # write to a uniquely named temp file first, so a crash never leaves a
+    # half-written db behind and concurrent compilers don't share one file
+    directory = os.path.dirname(db_path) or "."
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(db_path) + ".", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(DB_MAGIC)
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(index.tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp_path, 0o644)  # mkstemp files are owner-only
+        os.replace(tmp_path, db_path)
+    except OSError as e:
+        # read-only installs still work, they just parse the CSVs every start
+        print(f"Could not write recipe database {db_path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return index
+
+
+def load_recipe_db(data_dir: str = "data", db_path: str = None) -> RecipeIndex:
+    """
+    Load the compiled recipe database, rebuilding it first if it is missing,
+    from an older version, or any source CSV changed since it was compiled.
+    """
+    db_path = db_path or os.path.join(data_dir, DEFAULT_DB_NAME)
+    header = _header(data_dir)
+    try:
+        with open(db_path, "rb") as f:
+            if f.read(len(DB_MAGIC)) != DB_MAGIC:
+                raise ValueError("bad magic")
+            # the header is a separate pickle so a stale db is rejected without loading tables
+            if pickle.load(f) != header:
+                return compile_recipe_db(data_dir, db_path)
+            return RecipeIndex(pickle.load(f))
+    except FileNotFoundError:
+        return compile_recipe_db(data_dir, db_path)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+        print(f"Recipe database {db_path} unreadable ({e}), rebuilding")
+        return compile_recipe_db(data_dir, db_path)
+
+
+if __name__ == "__main__":
+    # python -m game.recipe_db  -> (re)compile data/recipes.db
+    idx = compile_recipe_db()
+    total = sum(len(t) for t in idx.tables.values())
+    print(f"Compiled {total} recipes into {os.path.join('data', DEFAULT_DB_NAME)}")
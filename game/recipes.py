@@ -0,0 +1,195 @@
+import csv
+import os
+import sys
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Optional, Tuple
+
+# station name -> (csv file in data/, input columns in slot order, output columns)
+STATION_TABLES = {
+    "Retort": ("Retort.csv", ("Input",), ("Output1", "Output2", "Output3")),
+    "Mortar": ("Mortar.csv", ("Solid",), ("Output",)),
+    "Calcinator": ("Calcinator.csv", ("Solid1", "Solid2"), ("Output",)),
+    "Alembic": ("Alembic.csv", ("Liquid1", "Essence1"), ("Output",)),
+    "Infuser": ("Infuser.csv", ("Solid1", "Liquid1"), ("Output",)),
+    "Magic Wand": ("Magic_Wand.csv", ("Essence1", "Essence2"), ("Output",)),
+    "Cauldron": ("Cauldron.csv", ("Liquid", "Solid", "Essence"), ("Output",)),
+}
+
+# stations whose inputs are interchangeable: (A, B) and (B, A) are the same recipe
+COMMUTATIVE_STATIONS = frozenset({"Calcinator", "Magic Wand"})
+
+
+def canonical_key(station: str, inputs: Iterable[str]) -> Tuple[str, ...]:
+    """Recipe key for a station; commutative stations use a sorted (multiset) key."""
+    if station in COMMUTATIVE_STATIONS:
+        return tuple(sorted(inputs))
+    return tuple(inputs)
+
+
+def _clean(value) -> Optional[str]:
+    # Filter out NaN, None, empty, and the literal "None"
+    if not isinstance(value, str):
+        return None
+    if value.strip() == "" or value.strip().lower() == "none":
+        return None
+    return sys.intern(value)
+
+
+class RecipeIndex:
+    """
+    Hash index over the station recipe tables.
+    tables[station][(input1, input2, ...)] = (output1, ...)
+    Built once from the CSVs so a mix is a single dict lookup.
+    Commutative stations store one canonical key per recipe, so rows that
+    only repeat a recipe in the other slot order collapse into one entry.
+    """
+    def __init__(self, tables: Optional[Dict[str, Dict[Tuple[str, ...], Tuple[str, ...]]]] = None):
+        self.tables = tables if tables is not None else {name: {} for name in STATION_TABLES}
+
+    def add(self, station: str, inputs: Iterable, outputs: Iterable) -> None:
+        inputs = tuple(inputs)
+        # rows with a blank input can never match a slotted ingredient
+        if any(not isinstance(i, str) or i == "" for i in inputs):
+            return
+        table = self.tables.setdefault(station, {})
+        # interned names are shared between keys/outputs (and pickled only once)
+        key = canonical_key(station, map(sys.intern, inputs))
+        outputs = tuple(o for o in map(_clean, outputs) if o)
+        existing = table.get(key)
+        # first matching row wins, same as the old iloc[0] lookups
+        if existing is None:
+            table[key] = outputs
+        elif existing != outputs:
+            print(f"Conflicting {station} recipe for {inputs}: keeping {existing}, ignoring {outputs}")
+
+    def lookup(self, station: str, *inputs: str) -> Optional[Tuple[str, ...]]:
+        """Outputs for a recipe, () if the row has no outputs, None if there is no recipe."""
+        table = self.tables.get(station)
+        if table is None:
+            return None
+        if station in COMMUTATIVE_STATIONS:
+            inputs = tuple(sorted(inputs))
+        return table.get(inputs)
+
+    def names(self) -> Tuple[str, ...]:
+        """Every ingredient/product name in the tables, in first-seen order."""
+        seen = {}
+        for table in self.tables.values():
+            for inputs, outputs in table.items():
+                seen.update(dict.fromkeys(inputs))
+                seen.update(dict.fromkeys(outputs))
+        return tuple(seen)
+
+    @classmethod
+    def from_csv_dir(cls, data_dir: str = "data") -> "RecipeIndex":
+        """Build the index with the stdlib csv module (no pandas import)."""
+        index = cls()
+        for station, (filename, in_cols, out_cols) in STATION_TABLES.items():
+            with open(os.path.join(data_dir, filename), newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    index.add(station, (row.get(c) for c in in_cols), (row.get(c) for c in out_cols))
+        return index
+
+
+class PandasRecipeIndex(RecipeIndex):
+    """
+    RecipeIndex that also keeps every table as a DataFrame in self.frames.
+    Meant for analysis tooling; the game itself uses the stdlib backend.
+    Lookups still go through the hash index, never through the frames.
+    """
+    def __init__(self, frames):
+        super().__init__()
+        self.frames = frames
+        for station, (_filename, in_cols, out_cols) in STATION_TABLES.items():
+            df = frames[station]
+            n = len(in_cols)
+            for row in zip(*(df[c] for c in in_cols + out_cols)):
+                self.add(station, row[:n], row[n:])
+
+    @classmethod
+    def from_csv_dir(cls, data_dir: str = "data") -> "PandasRecipeIndex":
+        import pandas as pd  # only analysis tooling pays for the pandas import
+        frames = {
+            station: pd.read_csv(os.path.join(data_dir, filename))
+            for station, (filename, _in_cols, _out_cols) in STATION_TABLES.items()
+        }
+        return cls(frames)
+
+
+# ---------------- Backends ----------------
+DEFAULT_BACKEND = "stdlib"
+BACKEND_ENV_VAR = "POTION_RECIPE_BACKEND"
+
+
+def _load_stdlib(data_dir: str) -> RecipeIndex:
+    from game.recipe_db import load_recipe_db
+    return load_recipe_db(data_dir)
+
+
+def _load_pandas(data_dir: str) -> RecipeIndex:
+    return PandasRecipeIndex.from_csv_dir(data_dir)
+
+
+RECIPE_BACKENDS = {
+    "stdlib": _load_stdlib,   # compiled data/recipes.db, rebuilt with the csv module
+    "pandas": _load_pandas,   # DataFrames kept in .frames for analysis
+}
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    return backend or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+
+
+def load_recipes(data_dir: str = "data", backend: Optional[str] = None) -> RecipeIndex:
+    """
+    Load the recipe tables with the chosen backend.
+    backend=None uses $POTION_RECIPE_BACKEND, falling back to "stdlib".
+    """
+    backend = _resolve_backend(backend)
+    try:
+        loader = RECIPE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown recipe backend: {backend}") from None
+    return loader(data_dir)
+
+
+# ---------------- Shared store ----------------
+class RecipeStore(RecipeIndex):
+    """
+    Immutable recipe tables shared by every Mixing instance in the process.
+    RecipeStore.get() loads each (data_dir, backend) pair once; after that
+    the tables are read-only mapping proxies, so readers need no locking.
+    """
+    _instances: Dict[Tuple[str, str], "RecipeStore"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, index: RecipeIndex):
+        super().__init__(MappingProxyType({
+            station: MappingProxyType(dict(table)) for station, table in index.tables.items()
+        }))
+        # DataFrames from the pandas backend, None for stdlib
+        self.frames = getattr(index, "frames", None)
+
+    def add(self, station, inputs, outputs):
+        raise TypeError("RecipeStore is read-only")
+
+    @classmethod
+    def get(cls, data_dir: str = "data", backend: Optional[str] = None) -> "RecipeStore":
+        backend = _resolve_backend(backend)
+        key = (os.path.abspath(data_dir), backend)
+        store = cls._instances.get(key)
+        if store is None:
+            with cls._lock:
+                # another thread may have finished loading while we waited
+                store = cls._instances.get(key)
+                if store is None:
+                    store = cls(load_recipes(data_dir, backend))
+                    cls._instances[key] = store
+        return store
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the shared stores so the next get() reloads (e.g. after editing CSVs)."""
+        with cls._lock:
+            cls._instances.clear()
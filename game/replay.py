@@ -0,0 +1,202 @@
+"""
+Record the pygame event stream of a play session and replay it headless.
+
+Recording (from the game):
+    POTION_RECORD=session.jsonl python main.py
+
+Replaying a batch of sessions, timed per subsystem:
+    python -m game.replay session.jsonl [more.jsonl ...] [--repeat 100] [--no-draw]
+
+A recording is JSON lines: a header, then one line per frame that had
+input, {"t": seconds since start, "events": [...]}.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import pygame
+from game import clock
+from game.clock import ManualClock, set_clock
+from game.profiler import profiler
+
+REPLAY_VERSION = 1
+
+# event types worth recording, by name so recordings survive pygame upgrades
+RECORDED_EVENTS = {
+    pygame.QUIT: "QUIT",
+    pygame.MOUSEMOTION: "MOUSEMOTION",
+    pygame.MOUSEBUTTONDOWN: "MOUSEBUTTONDOWN",
+    pygame.MOUSEBUTTONUP: "MOUSEBUTTONUP",
+    pygame.MOUSEWHEEL: "MOUSEWHEEL",
+    pygame.KEYDOWN: "KEYDOWN",
+    pygame.KEYUP: "KEYUP",
+    pygame.WINDOWFOCUSGAINED: "WINDOWFOCUSGAINED",
+    pygame.WINDOWFOCUSLOST: "WINDOWFOCUSLOST",
+}
+EVENT_TYPES = {name: etype for etype, name in RECORDED_EVENTS.items()}
+
+
+# ---------------- Events <-> JSON ----------------
+def event_to_dict(event):
+    """JSON-friendly copy of a recorded event (None for types we don't record)."""
+    name = RECORDED_EVENTS.get(event.type)
+    if name is None:
+        return None
+    out = {"type": name}
+    for key, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            out[key] = value
+        elif isinstance(value, tuple):
+            out[key] = list(value)
+        # anything else (e.g. the window object) is left out
+    return out
+
+
+def event_from_dict(data):
+    attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in data.items() if k != "type"}
+    return pygame.event.Event(EVENT_TYPES[data["type"]], attrs)
+
+
+# ---------------- Recording ----------------
+class EventRecorder:
+    """Appends every frame's input to a recording file."""
+    def __init__(self, path, screen_size=None):
+        self.path = path
+        self._file = open(path, "w")
+        self._start = clock.now()
+        header = {"version": REPLAY_VERSION, "screen": list(screen_size) if screen_size else None}
+        self._file.write(json.dumps(header) + "\n")
+
+    def record(self, events):
+        frame = [d for d in map(event_to_dict, events) if d is not None]
+        if frame:
+            t = round(clock.now() - self._start, 4)
+            self._file.write(json.dumps({"t": t, "events": frame}) + "\n")
+
+    def close(self):
+        self._file.close()
+        print(f"Recorded session written to {self.path}")
+
+
+def load_recording(path):
+    """(header, [(t, [Event, ...]), ...]) from a recording file."""
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {header.get('version')}")
+        frames = []
+        for line in f:
+            if line.strip():
+                frame = json.loads(line)
+                frames.append((frame["t"], [event_from_dict(e) for e in frame["events"]]))
+    return header, frames
+
+
+# ---------------- Replaying ----------------
+def new_headless_game(screen):
+    """A GameManager with everything preloaded and level stats kept out of data/."""
+    from game.game_manager import GameManager, SCENE_RESOURCES
+    game = GameManager(screen)
+    game.preloader.wait(*{r for reqs in SCENE_RESOURCES.values() for r in reqs})
+    game.update()
+
+    # completing levels during a replay must not overwrite the player's stats
+    level_select = game.level_select_scene
+    fd, level_select.stats_path = tempfile.mkstemp(prefix="replay-stats-", suffix=".json")
+    os.close(fd)
+    level_select.stats = {"levels": {}}
+    level_select.refresh()
+    return game
+
+
+def replay(game, frames, draw=True):
+    """
+    Feed recorded frames through game.handle_event/update (and draw), as
+    fast as possible, timing the same scopes as the main loop. Game time
+    runs on a ManualClock set to each frame's recorded timestamp, so
+    notifications expire exactly as they did while recording.
+    Returns {"frames", "events", "recorded_s", "wall_s"}.
+    """
+    # start where the real clock is, so timestamps taken before the swap stay comparable
+    virtual = ManualClock(clock.now())
+    previous = set_clock(virtual)
+    start = time.perf_counter()
+    try:
+        _replay_frames(game, frames, virtual, draw)
+    finally:
+        set_clock(previous)
+    events = sum(len(frame) for _t, frame in frames)
+    return {
+        "frames": len(frames),
+        "events": events,
+        "recorded_s": frames[-1][0] if frames else 0.0,
+        "wall_s": time.perf_counter() - start,
+    }
+
+
+def _replay_frames(game, frames, virtual, draw):
+    origin = virtual.now()
+    for t, frame in frames:
+        virtual.set(origin + t)
+        with profiler.scope("events"):
+            for event in frame:
+                game.handle_event(event)
+        with profiler.scope("update"):
+            game.update()
+        if draw:
+            with profiler.scope("draw"):
+                game.draw()
+
+
+def replay_files(paths, repeat=1, draw=True):
+    """Replay every recording `repeat` times, each run in a fresh game. Returns per-run results."""
+    screen = pygame.display.set_mode((960, 640))
+    recordings = [(p, load_recording(p)[1]) for p in paths]
+    results = []
+    profiler.reset()
+    for _ in range(repeat):
+        for path, frames in recordings:
+            game = new_headless_game(screen)
+            try:
+                with profiler.scope("session"):
+                    result = replay(game, frames, draw)
+            finally:
+                stats_path = game.level_select_scene.stats_path
+                game.close()
+                os.remove(stats_path)
+            result["file"] = path
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded sessions headless.")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--repeat", type=int, default=1, help="replay each recording this many times")
+    parser.add_argument("--no-draw", action="store_true", help="skip drawing (event handling and update only)")
+    parser.add_argument("--profile", metavar="PATH", help="write the timing histograms as JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+    results = replay_files(args.recordings, args.repeat, draw=not args.no_draw)
+    wall = sum(r["wall_s"] for r in results)
+    recorded = sum(r["recorded_s"] for r in results)
+    events = sum(r["events"] for r in results)
+    print(f"{len(results)} sessions, {events} events, {recorded:.1f}s of play replayed in {wall:.3f}s")
+
+    print(f"{'scope':<22}{'count':>8}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, s in profiler.summary().items():
+        print(f"{name:<22}{s['count']:>8}{s['mean_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['max_ms']:>10.3f}")
+    for name, counters in profiler.counters().items():
+        print(f"{name}: {counters}")
+    if args.profile:
+        profiler.dump(args.profile)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
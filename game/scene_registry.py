@@ -0,0 +1,54 @@
+import importlib
+from game import clock
+
+
+class SceneRegistry:
+    """
+    Builds scenes the first time they are needed, importing their module
+    only then, and caches them afterwards. Scenes not shown for
+    release_after seconds can be dropped with release_idle(); their
+    close() method (if any) gives shared assets back.
+    """
+    def __init__(self, release_after=None):
+        self.release_after = release_after
+        self._specs = {}      # name -> ("package.module", "ClassName", factory)
+        self._scenes = {}
+        self._last_used = {}
+
+    def register(self, name, module, class_name, factory):
+        """factory(scene_class) -> scene instance; called on first get()."""
+        self._specs[name] = (module, class_name, factory)
+
+    def get(self, name):
+        scene = self._scenes.get(name)
+        if scene is None:
+            module, class_name, factory = self._specs[name]
+            cls = getattr(importlib.import_module(module), class_name)
+            scene = factory(cls)
+            self._scenes[name] = scene
+        self._last_used[name] = clock.now()
+        return scene
+
+    def peek(self, name):
+        """The scene if it has been built, without building or touching it."""
+        return self._scenes.get(name)
+
+    def touch(self, name):
+        if name in self._scenes:
+            self._last_used[name] = clock.now()
+
+    def release(self, name):
+        scene = self._scenes.pop(name, None)
+        self._last_used.pop(name, None)
+        if scene is not None and hasattr(scene, "close"):
+            scene.close()
+
+    def release_idle(self, keep=()):
+        """Drop scenes (other than keep) that haven't been used for release_after seconds."""
+        if self.release_after is None:
+            return []
+        cutoff = clock.now() - self.release_after
+        idle = [n for n, t in self._last_used.items() if t < cutoff and n not in keep]
+        for name in idle:
+            self.release(name)
+        return idle
@@ -0,0 +1,318 @@
+from typing import NamedTuple, Optional
+from game.PotionMixerCommand import Command, CommandHistory, Inventory, InventorySnapshot, Mixing
+from game.mixing_level import load_level_data, build_inventory_from_level, kind_for, KIND_TO_CATEGORY
+
+# stations always the same, in the order they are shown on screen
+STATION_NAMES = [
+    "Retort", "Mortar", "Calcinator", "Cauldron",
+    "Alembic", "Infuser", "Magic Wand"
+]
+
+# station slot rules per station: list of expected categories for each slot
+STATION_SLOT_REQUIREMENTS = {
+    "Retort": ["liquid"],
+    "Mortar": ["solid"],
+    "Calcinator": ["solid", "solid"],
+    "Cauldron": ["liquid", "solid", "essence"],
+    "Alembic": ["liquid", "essence"],
+    "Infuser": ["solid", "liquid"],
+    "Magic Wand": ["essence", "essence"],
+}
+
+# inventory kind each station's outputs are added to
+STATION_OUTPUT_KINDS = {
+    "Retort": "essences",
+    "Mortar": "solids",
+    "Calcinator": "solids",
+    "Cauldron": "potions",
+    "Alembic": "fluids",
+    "Infuser": "fluids",
+    "Magic Wand": "essences",
+}
+
+# station name -> Mixing method
+STATION_METHODS = {
+    "Retort": "Retort",
+    "Mortar": "Mortar",
+    "Calcinator": "Calcinator",
+    "Cauldron": "Cauldron",
+    "Alembic": "Alembic",
+    "Infuser": "Infuser",
+    "Magic Wand": "Magic_Wand",
+}
+
+
+# undoable actions kept per level (the oldest are forgotten first)
+DEFAULT_HISTORY_LIMIT = 100
+
+
+def _empty_slots():
+    return {name: [None for _ in reqs] for name, reqs in STATION_SLOT_REQUIREMENTS.items()}
+
+
+class Outcome(NamedTuple):
+    """Result of a session action. ok=False means nothing changed."""
+    ok: bool
+    message: str = ""
+    completed: bool = False  # this action just completed the level
+
+
+class SessionSnapshot(NamedTuple):
+    """Checkpoint of a session's mutable state (see GameSession.snapshot)."""
+    inventory: InventorySnapshot
+    ingredient_category: dict
+    station_slots: dict
+    complete: bool
+
+
+class GameSession:
+    """
+    Headless game state for one level: inventory, station slots, retries and
+    the objective. No pygame here, so it can be driven from tests and tools;
+    MixingScene is only a view over it.
+
+    Placements, removals and mixes are recorded as Commands holding only
+    their inventory delta, so undo()/redo() never re-run a mix and the
+    history costs memory per touched item, not per inventory.
+    """
+    def __init__(self, level_data: Optional[dict] = None, mixing: Optional[Mixing] = None,
+                 history_limit: int = DEFAULT_HISTORY_LIMIT):
+        # recipe tables are shared process-wide, so this is cheap
+        self.mixing = mixing or Mixing()
+
+        self.level_data = None
+        self.current_level = 1
+        self.objective = "Brew something magical!"
+        self.target_potion = None
+        self.complete = False
+        self.retry_count = 0
+
+        self.inventory = Inventory()
+        # categories: mapping ingredient_name -> category (solid/liquid/essence/potion)
+        self.ingredient_category = {}
+        self.station_slots = _empty_slots()
+        # the level's starting state, restored by retry()
+        self._start: Optional[SessionSnapshot] = None
+        # ingredient_category is shared with a snapshot until the next new output
+        self._categories_shared = False
+        self.history = CommandHistory(history_limit)
+
+        if level_data is not None:
+            self.load(level_data)
+
+    @classmethod
+    def from_level(cls, level_number: int, mixing: Optional[Mixing] = None) -> Optional["GameSession"]:
+        data = load_level_data(level_number)
+        if data is None:
+            return None
+        return cls(data, mixing)
+
+    # ---------------- Level ----------------
+    def load(self, data: dict, level_number: Optional[int] = None) -> None:
+        """Start (or restart) a level from its parsed JSON data."""
+        self.level_data = data
+        self.current_level = data.get("level", level_number if level_number is not None else self.current_level)
+        self.objective = data.get("objective", "Unknown objective")
+        self.target_potion = data.get("target_potion") or data.get("objective_potion")
+        self.complete = False
+        self.inventory, self.ingredient_category = build_inventory_from_level(data)
+        self.station_slots = _empty_slots()
+        self._start = self.snapshot()
+        self.history.clear()
+
+    def clear(self) -> None:
+        """Empty the inventory and slots, e.g. when a requested level does not exist."""
+        self.inventory = Inventory()
+        self.ingredient_category = {}
+        self.station_slots = _empty_slots()
+        self._start = None
+        self.history.clear()
+
+    def retry(self) -> Outcome:
+        """Bump the retry counter and restore the level's starting state (no reload)."""
+        self.retry_count += 1
+        if self._start is not None:
+            self.restore(self._start)
+        return Outcome(True)
+
+    # ---------------- Snapshots ----------------
+    def snapshot(self) -> SessionSnapshot:
+        """Cheap checkpoint: the inventory and categories are shared copy-on-write."""
+        self._categories_shared = True
+        return SessionSnapshot(
+            self.inventory.snapshot(),
+            self.ingredient_category,
+            {name: list(slots) for name, slots in self.station_slots.items()},
+            self.complete,
+        )
+
+    def restore(self, snap: SessionSnapshot) -> None:
+        """Return to a checkpoint taken on this session (reservations included)."""
+        self.inventory.restore(snap.inventory)
+        self.ingredient_category = snap.ingredient_category
+        self._categories_shared = True
+        self.station_slots = {name: list(slots) for name, slots in snap.station_slots.items()}
+        self.complete = snap.complete
+        # recorded deltas only apply to the state they were recorded on
+        self.history.clear()
+
+    # ---------------- Undo / redo ----------------
+    def _recorded(self, action: str, station: str, fn, *args) -> Outcome:
+        """Run a slot or mix action, recording it in the history if it succeeds."""
+        slots = self.station_slots.get(station)
+        before = tuple(slots) if slots is not None else ()
+        complete_before = self.complete
+        self.inventory.start_journal()
+        try:
+            outcome = fn(station, *args)
+        finally:
+            delta = self.inventory.stop_journal()
+        if outcome.ok:
+            self.history.record(Command(action, station, before, tuple(self.station_slots[station]),
+                                        delta, complete_before, self.complete))
+        return outcome
+
+    def undo(self) -> Outcome:
+        """Reverse the last recorded action."""
+        command = self.history.undo()
+        if command is None:
+            return Outcome(False, "Nothing to undo")
+        self.inventory.apply_delta(command.delta, reverse=True)
+        self.inventory.cleanup()
+        self.station_slots[command.station] = list(command.slots_before)
+        self.complete = command.complete_before
+        return Outcome(True, f"Undid {command.action} at {command.station}")
+
+    def redo(self) -> Outcome:
+        """Apply the last undone action again."""
+        command = self.history.redo()
+        if command is None:
+            return Outcome(False, "Nothing to redo")
+        self.inventory.apply_delta(command.delta)
+        self.inventory.cleanup()
+        self._categorize_outputs()
+        self.station_slots[command.station] = list(command.slots_after)
+        completed = command.complete_after and not self.complete
+        self.complete = command.complete_after
+        return Outcome(True, f"Redid {command.action} at {command.station}", completed)
+
+    # ---------------- Slots ----------------
+    def _slot(self, station: str, slot: int):
+        slots = self.station_slots.get(station)
+        if slots is None:
+            return None, Outcome(False, f"Unknown station: {station}")
+        if not 0 <= slot < len(slots):
+            return None, Outcome(False, f"{station} has no slot {slot}")
+        return slots, None
+
+    def place(self, station: str, slot: int, ingredient: str) -> Outcome:
+        """Reserve one ingredient from the inventory for a station slot."""
+        return self._recorded("place", station, self._place, slot, ingredient)
+
+    def _place(self, station: str, slot: int, ingredient: str) -> Outcome:
+        slots, err = self._slot(station, slot)
+        if err:
+            return err
+        if slots[slot] is not None:
+            return Outcome(False, "Slot already filled")
+        if not ingredient:
+            return Outcome(False, "Select an ingredient first")
+
+        expected = STATION_SLOT_REQUIREMENTS[station][slot]
+        cat = self.ingredient_category.get(ingredient, None)
+        if expected and expected != cat:
+            return Outcome(False, f"Needs {expected}")
+
+        kind = kind_for(cat or expected or "solid")
+        if not self.inventory.reserve(ingredient, kind, 1, holder=station):
+            return Outcome(False, "Out of stock")
+        slots[slot] = ingredient
+        return Outcome(True)
+
+    def remove(self, station: str, slot: int) -> Outcome:
+        """Take an ingredient back out of a slot and return its reservation."""
+        return self._recorded("remove", station, self._remove, slot)
+
+    def _remove(self, station: str, slot: int) -> Outcome:
+        slots, err = self._slot(station, slot)
+        if err:
+            return err
+        name = slots[slot]
+        if name is None:
+            return Outcome(False, "Slot is empty")
+        expected = STATION_SLOT_REQUIREMENTS[station][slot]
+        cat = self.ingredient_category.get(name, expected or "solid")
+        self.inventory.unreserve(name, kind_for(cat), 1, holder=station)
+        slots[slot] = None
+        return Outcome(True)
+
+    def clear_station(self, station: str) -> Outcome:
+        """Empty every slot of a station, returning all its reserved items at once."""
+        if not any(self.station_slots.get(station) or ()):
+            # nothing slotted: closing an empty station is not worth an undo step
+            return self._clear_station(station)
+        return self._recorded("clear", station, self._clear_station)
+
+    def _clear_station(self, station: str) -> Outcome:
+        if station not in self.station_slots:
+            return Outcome(False, f"Unknown station: {station}")
+        self.inventory.rollback(station)
+        self.station_slots[station] = [None for _ in self.station_slots[station]]
+        return Outcome(True)
+
+    # ---------------- Mixing ----------------
+    def mix(self, station: str) -> Outcome:
+        return self._recorded("mix", station, self._mix)
+
+    def _mix(self, station: str) -> Outcome:
+        slots = self.station_slots.get(station)
+        if slots is None:
+            return Outcome(False, f"Unknown station: {station}")
+        if any(s is None for s in slots):
+            return Outcome(False, "Fill all slots before mixing!")
+
+        # The Mixing methods check and consume their inputs themselves, so the
+        # slotted items go back into the counts first; if the mixer fails they
+        # stay there instead of vanishing with the slots.
+        self.inventory.rollback(station)
+        try:
+            message = getattr(self.mixing, STATION_METHODS[station])(self.inventory, *slots)
+        except Exception as e:
+            message = f"Mixing error: {e}"
+
+        self.station_slots[station] = [None for _ in slots]
+        self.inventory.cleanup()
+        self._categorize_outputs()
+        return Outcome(True, message, self._check_objective())
+
+    def _categorize_outputs(self):
+        # station outputs have no category in the level file; take it from their bucket
+        for kind, cat in KIND_TO_CATEGORY.items():
+            for name, _count in self.inventory.get_items(kind):
+                if name not in self.ingredient_category:
+                    if self._categories_shared:
+                        self.ingredient_category = dict(self.ingredient_category)
+                        self._categories_shared = False
+                    self.ingredient_category[name] = cat
+
+    def _check_objective(self) -> bool:
+        """True exactly once: when target_potion is first owned."""
+        if not self.target_potion or self.complete:
+            return False
+        if self.inventory.check_inventory(self.target_potion, "potions"):
+            self.complete = True
+            return True
+        return False
+
+    # ---------------- State ----------------
+    def state(self) -> dict:
+        """Plain-data snapshot of the session, safe to compare or serialize."""
+        return {
+            "level": self.current_level,
+            "objective": self.objective,
+            "target_potion": self.target_potion,
+            "complete": self.complete,
+            "retries": self.retry_count,
+            "inventory": self.inventory.debug_counts(),
+            "slots": {name: list(slots) for name, slots in self.station_slots.items()},
+        }
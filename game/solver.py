@@ -0,0 +1,197 @@
+"""
+Shortest crafting path for a level.
+
+Breadth-first search over inventory states, where every edge is one
+successful station mix. Only recipes that can contribute to the target
+potion are considered, and the inventory is projected onto the items
+those recipes touch, so the state space stays small.
+
+    python -m game.solver [level ...]
+"""
+import sys
+from collections import deque
+from functools import lru_cache
+from operator import add
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from game.mixing_level import load_level_data, build_inventory_from_level, kind_for
+from game.recipes import RecipeStore
+from game.session import STATION_NAMES, STATION_SLOT_REQUIREMENTS, STATION_OUTPUT_KINDS
+
+# Safety net for pathological levels; the shipped ones need a few thousand states at most
+DEFAULT_MAX_STATES = 200_000
+
+Item = Tuple[str, str]  # (inventory kind, name)
+
+
+class Step(NamedTuple):
+    station: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+    def __str__(self):
+        return f"{self.station} ({', '.join(self.inputs)}) -> {', '.join(self.outputs)}"
+
+
+class SolverLimitError(RuntimeError):
+    """Raised when a search visits more than max_states inventories."""
+
+
+class _Move(NamedTuple):
+    step: Step
+    needs: Tuple[Tuple[Item, int], ...]
+    gives: Tuple[Tuple[Item, int], ...]
+
+
+def _tally(items) -> Tuple[Tuple[Item, int], ...]:
+    counts: Dict[Item, int] = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    return tuple(counts.items())
+
+
+@lru_cache(maxsize=None)
+def _all_moves(store: RecipeStore) -> Tuple[_Move, ...]:
+    """Every successful mix the recipe tables allow, as item deltas."""
+    moves = []
+    for station in STATION_NAMES:
+        in_kinds = [kind_for(cat) for cat in STATION_SLOT_REQUIREMENTS[station]]
+        out_kind = STATION_OUTPUT_KINDS[station]
+        for inputs, outputs in store.tables.get(station, {}).items():
+            if not outputs:
+                continue  # a recipe with no outputs only destroys ingredients
+            moves.append(_Move(
+                Step(station, inputs, outputs),
+                _tally(zip(in_kinds, inputs)),
+                _tally((out_kind, o) for o in outputs),
+            ))
+    return tuple(moves)
+
+
+@lru_cache(maxsize=256)
+def relevant_moves(store: RecipeStore, target: str) -> Tuple[_Move, ...]:
+    """Moves that produce the target or (transitively) an input of such a move."""
+    moves = _all_moves(store)
+    wanted = {("potions", target)}
+    chosen = set()
+    changed = True
+    while changed:
+        changed = False
+        for i, move in enumerate(moves):
+            if i in chosen or not any(item in wanted for item, _n in move.gives):
+                continue
+            chosen.add(i)
+            wanted.update(item for item, _n in move.needs)
+            changed = True
+    return tuple(moves[i] for i in sorted(chosen))
+
+
+def start_counts(level_data: dict) -> Dict[Item, int]:
+    inv, _categories = build_inventory_from_level(level_data)
+    return {
+        (kind, name): count
+        for kind, bucket in inv.debug_counts().items()
+        for name, count in bucket.items()
+        if count > 0
+    }
+
+
+def solve(level_data: dict, store: Optional[RecipeStore] = None,
+          max_states: int = DEFAULT_MAX_STATES) -> Optional[List[Step]]:
+    """
+    Minimal list of station mixes that brews the level's target potion,
+    [] if it is already owned, or None if the level cannot be solved.
+    """
+    store = store or RecipeStore.get()
+    target = level_data.get("target_potion") or level_data.get("objective_potion")
+    if not target:
+        return None
+    goal = ("potions", target)
+    counts = start_counts(level_data)
+    if counts.get(goal, 0) > 0:
+        return []
+
+    moves = reachable_moves(relevant_moves(store, target), counts)
+    # project the inventory onto the items the relevant recipes touch
+    items = sorted({goal} | {it for m in moves for it, _n in m.needs + m.gives})
+    slot = {item: i for i, item in enumerate(items)}
+    goal_i = slot[goal]
+    compiled = []
+    for m in moves:
+        delta = [0] * len(items)
+        for it, n in m.needs:
+            delta[slot[it]] -= n
+        for it, n in m.gives:
+            delta[slot[it]] += n
+        compiled.append((m.step, [(slot[it], n) for it, n in m.needs], tuple(delta)))
+
+    start = tuple(counts.get(item, 0) for item in items)
+    # state -> (previous state, step) for path reconstruction; doubles as the visited set
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        for step, needs, delta in compiled:
+            for i, n in needs:
+                if state[i] < n:
+                    break
+            else:
+                nxt = tuple(map(add, state, delta))
+                if nxt in parents:
+                    continue
+                parents[nxt] = (state, step)
+                if nxt[goal_i] > 0:
+                    return _path(parents, nxt)
+                if len(parents) > max_states:
+                    raise SolverLimitError(f"gave up after {max_states} states")
+                queue.append(nxt)
+    return None
+
+
+def reachable_moves(moves, counts: Dict[Item, int]) -> List[_Move]:
+    """Drop moves whose inputs can never be obtained from the starting inventory."""
+    have = {item for item, n in counts.items() if n > 0}
+    usable = []
+    pending = list(moves)
+    changed = True
+    while changed:
+        changed = False
+        for move in list(pending):
+            if all(item in have for item, _n in move.needs):
+                usable.append(move)
+                pending.remove(move)
+                have.update(item for item, _n in move.gives)
+                changed = True
+    return usable
+
+
+def _path(parents, state) -> List[Step]:
+    steps = []
+    while parents[state] is not None:
+        state, step = parents[state]
+        steps.append(step)
+    steps.reverse()
+    return steps
+
+
+def par(level_data: dict, store: Optional[RecipeStore] = None) -> Optional[int]:
+    """Fewest mixes needed to finish a level (None if unsolvable)."""
+    steps = solve(level_data, store)
+    return None if steps is None else len(steps)
+
+
+def solve_level(level_number: int, store: Optional[RecipeStore] = None) -> Optional[List[Step]]:
+    data = load_level_data(level_number)
+    if data is None:
+        return None
+    return solve(data, store)
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or [str(n) for n in range(1, 8)]:
+        steps = solve_level(int(arg))
+        if steps is None:
+            print(f"Level {arg}: no solution")
+            continue
+        print(f"Level {arg} ({len(steps)} mixes)")
+        for step in steps:
+            print(f"    - {step}")
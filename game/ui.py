@@ -1,5 +1,84 @@
 import pygame
-import time
+from collections import OrderedDict
+from game.assets_loader import load_image, release
+from game.profiler import profiler
+from game import clock
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered (and word-wrapped) text surfaces.
+    Keyed by (font, text, max_width, color); max_width=None means one line.
+    hits/misses are kept for profiling, see stats().
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lines(self, font, text, max_width, color):
+        """Rendered lines of text wrapped to max_width (list of Surfaces)."""
+        key = (font, text, max_width, color)
+        surfaces = self._entries.get(key)
+        if surfaces is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surfaces
+
+        self.misses += 1
+        with profiler.scope("text"):
+            wrapped = [text] if max_width is None else wrap_text(font, text, max_width)
+            surfaces = [font.render(ln, True, color) for ln in wrapped]
+        self._entries[key] = surfaces
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return surfaces
+
+    def render(self, font, text, color):
+        """Single-line equivalent of font.render(text, True, color)."""
+        return self.lines(font, text, None, color)[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# shared by every widget in this module
+text_cache = TextCache()
+profiler.add_counters(
+    "text cache", text_cache.stats,
+    lambda s: f"{s['hit_rate']:.1%} hits, {s['misses']} renders, {s['entries']}/{s['maxsize']} cached",
+)
+
+
+def wrap_text(font, text, max_width):
+    """Greedy word wrap: list of lines that each fit in max_width (long words get their own line)."""
+    lines = []
+    line = ""
+    for w in text.split():
+        test = (line + " " + w).strip()
+        if font.size(test)[0] <= max_width:
+            line = test
+        else:
+            if line:
+                lines.append(line)
+            line = w
+    if line:
+        lines.append(line)
+    return lines
+
 
 class Button:
     def __init__(self, text, x, y, width, height, font,
@@ -10,11 +89,28 @@ class Button:
         self.font = font
         self.color = color
         self.hover_color = hover_color
-        self.image = pygame.image.load(image).convert_alpha() if image else None
+        self.image = load_image(image) if image else None
+        # a button can appear under a cursor that isn't moving
+        self.hovered = False
+        self.sync_hover()
+
+    def sync_hover(self):
+        """Take the hover state from the current mouse position; True if it changed."""
+        if not pygame.display.get_init():
+            return False
+        return self.update_hover(pygame.mouse.get_pos())
+
+    def update_hover(self, pos):
+        """Track hover state; True if it changed and the button needs a redraw."""
+        hovered = self.rect.collidepoint(pos)
+        if hovered == self.hovered:
+            return False
+        self.hovered = hovered
+        return True
 
     def draw(self, screen):
-        mouse_pos = pygame.mouse.get_pos()
-        hovered = self.rect.collidepoint(mouse_pos)
+        # drawn from the tracked state, so dirty rendering repaints every change
+        hovered = self.hovered
         if self.image:
             screen.blit(self.image, self.rect)
             if hovered:
@@ -26,26 +122,12 @@ class Button:
             pygame.draw.rect(screen, current_color, self.rect, border_radius=10)
 
         # --- wrapped text ---
-        max_width = self.rect.w - 10
-        words = self.text.split()
-        lines = []
-        line = ""
-        for w in words:
-            test = (line + " " + w).strip()
-            if self.font.size(test)[0] <= max_width:
-                line = test
-            else:
-                if line:
-                    lines.append(line)
-                line = w
-        if line:
-            lines.append(line)
+        lines = text_cache.lines(self.font, self.text, self.rect.w - 10, (0, 0, 0))
 
         total_height = len(lines) * self.font.get_height()
         start_y = self.rect.centery - total_height // 2
 
-        for i, ln in enumerate(lines):
-            text_surface = self.font.render(ln, True, (0, 0, 0))
+        for i, text_surface in enumerate(lines):
             text_rect = text_surface.get_rect(center=(self.rect.centerx,
                                                       start_y + i * self.font.get_height()))
             screen.blit(text_surface, text_rect)
@@ -54,6 +136,12 @@ class Button:
     def is_clicked(self, event):
         return event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos)
 
+    def close(self):
+        """Give the button's image back to the asset registry (call when discarding it)."""
+        if self.image is not None:
+            release(self.image)
+            self.image = None
+
 
 def draw_slot(screen, x, y, w, h, font, content=None, highlight=False):
     rect = pygame.Rect(x, y, w, h)
@@ -62,16 +150,16 @@ def draw_slot(screen, x, y, w, h, font, content=None, highlight=False):
     pygame.draw.rect(screen, (200, 200, 200), rect, 2, border_radius=6)
     if content:
         max_width = w - 8
-        if font.size(content)[0] <= max_width:
+        lines = text_cache.lines(font, content, max_width, (255, 255, 255))
+        if len(lines) == 1 and lines[0].get_width() <= max_width:
             # single line, centered
-            txt = font.render(content, True, (255, 255, 255))
-            txt_rect = txt.get_rect(center=rect.center)
-            screen.blit(txt, txt_rect)
+            txt_rect = lines[0].get_rect(center=rect.center)
+            screen.blit(lines[0], txt_rect)
         else:
             # multi-line, top-left-ish
             draw_wrapped_text(screen, content, x + 4, y + 4, max_width, font, (255, 255, 255))
     else:
-        placeholder = font.render("Empty", True, (180, 180, 180))
+        placeholder = text_cache.render(font, "Empty", (180, 180, 180))
         screen.blit(placeholder, (x + 8, y + h//2 - placeholder.get_height()//2))
     return rect
 
@@ -79,20 +167,9 @@ def draw_slot(screen, x, y, w, h, font, content=None, highlight=False):
 
 def draw_wrapped_text(screen, text, x, y, max_width, font, color):
     """Draw text on multiple lines if it exceeds max_width."""
-    words = text.split(' ')
-    line = ""
-    for word in words:
-        test_line = f"{line} {word}".strip()
-        if font.size(test_line)[0] <= max_width:
-            line = test_line
-        else:
-            surface = font.render(line, True, color)
-            screen.blit(surface, (x, y))
-            y += font.get_height() + 2
-            line = word
-    if line:
-        surface = font.render(line, True, color)
+    for surface in text_cache.lines(font, text, max_width, color):
         screen.blit(surface, (x, y))
+        y += font.get_height() + 2
 
 
 class Popup:
@@ -110,6 +187,11 @@ class Popup:
         self.mix_btn = Button("Mix", x + w - 110, y + h - 56, 90, 40, font)
         self.close_btn = Button("Close", x + w - 210, y + h - 56, 90, 40, font)
 
+    def close(self):
+        """Release the Mix/Close button images."""
+        self.mix_btn.close()
+        self.close_btn.close()
+
     def draw(self):
         pygame.draw.rect(self.screen, (18, 18, 30), self.rect, border_radius=8)
         pygame.draw.rect(self.screen, (180, 180, 180), self.rect, 2, border_radius=8)
@@ -161,22 +243,89 @@ class Notification:
         self.font = font
         self.message = ""
         self.until = 0.0
+        # set when the message appears or expires, so dirty rendering can repaint it
+        self.changed = False
+        self._bg = None
 
     def set(self, text, duration=1.6):
         self.message = text
-        self.until = time.time() + duration
+        self.until = clock.now() + duration
+        self.changed = True
 
-    def draw(self, screen):
-        if not self.message or time.time() > self.until:
+    @property
+    def active(self):
+        return bool(self.message)
+
+    def update(self):
+        """Expire the message once its time is up (without waiting for a draw)."""
+        if self.message and clock.now() > self.until:
             self.message = ""
             self.until = 0.0
+            self.changed = True
+
+    def area(self, screen):
+        """Full-width band the message is drawn in, so any message length is covered."""
+        h = self.font.get_height() + 8
+        return pygame.Rect(0, 40 - h // 2 - 1, screen.get_width(), h + 2)
+
+    def draw(self, screen):
+        # past the deadline just skip painting; update() clears the message
+        # and marks the banner changed, so dirty rendering repaints it
+        if not self.message or clock.now() > self.until:
             return
 
-        surf = self.font.render(self.message, True, (255, 200, 100))
+        surf = text_cache.render(self.font, self.message, (255, 200, 100))
         rect = surf.get_rect(center=(screen.get_width() // 2, 40))
 
-        # draw semi-transparent background
-        bg = pygame.Surface((rect.w + 12, rect.h + 8), pygame.SRCALPHA)
-        bg.fill((10, 10, 10, 180))
-        screen.blit(bg, (rect.x - 6, rect.y - 4))
-        screen.blit(surf, rect)
\ No newline at end of file
+        # draw semi-transparent background (reused while the message size is unchanged)
+        size = (rect.w + 12, rect.h + 8)
+        if self._bg is None or self._bg.get_size() != size:
+            self._bg = pygame.Surface(size, pygame.SRCALPHA)
+            self._bg.fill((10, 10, 10, 180))
+        screen.blit(self._bg, (rect.x - 6, rect.y - 4))
+        screen.blit(surf, rect)
+
+
+class DirtyRegions:
+    """
+    Screen rectangles that changed since the last frame.
+    Widgets/scenes mark() what they changed; the main loop repaints and
+    pushes only consume()'d rects with pygame.display.update(rects).
+    """
+    # past this fraction of the screen a single full repaint is cheaper
+    FULL_REDRAW_RATIO = 0.5
+
+    def __init__(self, bounds):
+        self.bounds = pygame.Rect(bounds)
+        self.rects = []
+        self.full = True  # first frame always paints everything
+
+    def mark(self, rect):
+        if rect is not None and not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full = True
+        self.rects.clear()
+
+    def consume(self):
+        """Merged dirty rects for this frame ([] if nothing changed), then reset."""
+        if self.full:
+            rects = [self.bounds.copy()]
+        else:
+            rects = []
+            for r in self.rects:
+                r = r.clip(self.bounds)
+                if not r.w or not r.h:
+                    continue
+                # merge with anything it overlaps so nothing is painted twice
+                i = r.collidelist(rects)
+                while i != -1:
+                    r = r.union(rects.pop(i))
+                    i = r.collidelist(rects)
+                rects.append(r)
+            if sum(r.w * r.h for r in rects) > self.bounds.w * self.bounds.h * self.FULL_REDRAW_RATIO:
+                rects = [self.bounds.copy()]
+        self.full = False
+        self.rects.clear()
+        return rects
@@ -0,0 +1,134 @@
+"""
+Check every level file for solvability and bad ingredient names.
+
+    python -m game.verify_levels [levels_dir] [--jobs N]
+
+Levels are solved in a process pool (one worker per core by default).
+Exits with status 1 if any level is unsolvable, unreadable or names an
+ingredient/potion that does not appear in the recipe tables.
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from game.levels import LEVEL_FILE
+from game.recipes import RecipeStore
+from game.solver import solve, relevant_moves, reachable_moves, start_counts, SolverLimitError
+
+
+@lru_cache(maxsize=1)
+def _known_names():
+    """Every ingredient name that appears anywhere in the recipe tables."""
+    names = set()
+    for table in RecipeStore.get().tables.values():
+        for inputs, outputs in table.items():
+            names.update(inputs)
+            names.update(outputs)
+    return frozenset(names)
+
+
+def verify_level(path: str) -> dict:
+    """Solve one level file and collect everything wrong with it."""
+    report = {
+        "file": os.path.basename(path),
+        "level": None,
+        "target": None,
+        "par": None,
+        "unknown": [],
+        "suggestions": {},
+        "unused": [],
+        "error": None,
+    }
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        report["error"] = f"unreadable: {e}"
+        return report
+
+    store = RecipeStore.get()
+    known = _known_names()
+    target = data.get("target_potion") or data.get("objective_potion")
+    report["level"] = data.get("level")
+    report["target"] = target
+
+    names = [ing.get("name") if isinstance(ing, dict) else str(ing) for ing in data.get("ingredients", [])]
+    names = [n for n in names if n]
+    for name in names + ([target] if target else []):
+        if name not in known:
+            report["unknown"].append(name)
+            close = difflib.get_close_matches(name, known, n=1, cutoff=0.8)
+            if close:
+                report["suggestions"][name] = close[0]
+
+    if not target:
+        report["error"] = "no target_potion"
+        return report
+
+    counts = start_counts(data)
+    usable = reachable_moves(relevant_moves(store, target), counts)
+    consumed = {name for move in usable for (_kind, name), _n in move.needs}
+    report["unused"] = [n for n in names if n not in consumed and n != target]
+
+    try:
+        steps = solve(data, store)
+    except SolverLimitError as e:
+        report["error"] = str(e)
+        return report
+    if steps is None:
+        report["error"] = "unsolvable"
+    else:
+        report["par"] = len(steps)
+    return report
+
+
+def level_files(levels_dir: str):
+    """levelN.json paths (the files the game loads), ordered by level number."""
+    numbered = []
+    for f in os.listdir(levels_dir):
+        m = LEVEL_FILE.match(f)
+        if m:
+            numbered.append((int(m.group(1)), os.path.join(levels_dir, f)))
+    return [path for _n, path in sorted(numbered)]
+
+
+def verify_all(levels_dir: str = os.path.join("data", "levels"), jobs: int = None):
+    paths = level_files(levels_dir)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        return [verify_level(p) for p in paths]
+    # compile/refresh recipes.db here, once, so the workers only ever read it
+    RecipeStore.get()
+    # then load the shared recipe store once per worker rather than once per level
+    with ProcessPoolExecutor(max_workers=jobs, initializer=RecipeStore.get) as pool:
+        chunk = max(1, len(paths) // (jobs * 4))
+        return list(pool.map(verify_level, paths, chunksize=chunk))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify that every level can be completed.")
+    parser.add_argument("levels_dir", nargs="?", default=os.path.join("data", "levels"))
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    reports = verify_all(args.levels_dir, args.jobs)
+    failed = 0
+    for r in reports:
+        bad = r["error"] or r["unknown"]
+        failed += bool(bad)
+        status = f"par {r['par']}" if r["par"] is not None else r["error"]
+        print(f"{'FAIL' if bad else 'ok  '} {r['file']}: {r['target']} ({status})")
+        for name in r["unknown"]:
+            hint = r["suggestions"].get(name)
+            print(f"       unknown name: {name}" + (f" (did you mean {hint}?)" if hint else ""))
+        if r["unused"]:
+            print(f"       unused ingredients: {', '.join(r['unused'])}")
+    print(f"{len(reports)} levels checked, {failed} with problems")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
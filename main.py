@@ -1,5 +1,10 @@
+import os
 import pygame
+from game.clock import AcceleratedClock, get_clock, set_clock
 from game.game_manager import GameManager
+from game.profiler import profiler
+from game.replay import EventRecorder
+from game.power import power_policy
 
 # Initialize Pygame
 pygame.init()
@@ -7,34 +12,66 @@ pygame.init()
 # Constants
 SCREEN_WIDTH = 960
 SCREEN_HEIGHT = 640
-FPS = 60
+DIRTY_RENDERING = True  # repaint only changed regions instead of the whole screen
+POWER_POLICY = power_policy()  # "performance" / "balanced" / "saver", see game/power.py
+PROFILE_DUMP = os.environ.get("POTION_PROFILE_DUMP")  # e.g. profile.json; F3 shows the live overlay
+RECORD_PATH = os.environ.get("POTION_RECORD")  # e.g. session.jsonl, replay with python -m game.replay
+CLOCK_SPEED = float(os.environ.get("POTION_CLOCK_SPEED", 1))  # >1 runs game time faster (testing)
 
 # Create the main game window
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Potion Mixer Deluxe")
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Clock for game time and controlling frame rate
+if CLOCK_SPEED != 1:
+    set_clock(AcceleratedClock(CLOCK_SPEED))
+clock = get_clock()
 
 # Create GameManager instance
-game = GameManager(screen)
+game = GameManager(screen, dirty_rendering=DIRTY_RENDERING)
+
+recorder = EventRecorder(RECORD_PATH, screen.get_size()) if RECORD_PATH else None
 
 # Main loop
 running = True
+focused = True
 while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        game.handle_event(event)
+    # sleep in event.wait while nothing is animating instead of spinning at full frame rate
+    idle = not game.is_animating()
+    events = POWER_POLICY.next_events(idle, focused)
+    if recorder:
+        recorder.record(events)
+
+    # "frame" is the work done this frame, without the sleep in event.wait/tick
+    with profiler.scope("frame"):
+        with profiler.scope("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.WINDOWFOCUSLOST:
+                    focused = False
+                elif event.type == pygame.WINDOWFOCUSGAINED:
+                    focused = True
+                game.handle_event(event)
 
-    # Update game logic
-    game.update()
+        # Update game logic
+        with profiler.scope("update"):
+            game.update()
 
-    # Draw everything
-    game.draw()
+        # Draw everything (or, in dirty mode, only what changed)
+        with profiler.scope("draw"):
+            dirty_rects = game.draw()
 
-    # Update display
-    pygame.display.flip()
-    clock.tick(FPS)
+        # Update display
+        with profiler.scope("flip"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+    clock.tick(POWER_POLICY.fps(focused))
 
+if recorder:
+    recorder.close()
+if PROFILE_DUMP:
+    profiler.dump(PROFILE_DUMP)
 pygame.quit()